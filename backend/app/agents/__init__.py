@@ -1,31 +1,65 @@
 """
 MindGlass Agents Module
+
+Agent classes are built from AGENT_SPECS on first use so that importing this
+package does not pull in the Cerebras SDK up front.
 """
 
-from app.agents.base import BaseAgent, LLMAgent
-from app.agents.analyst import AnalystAgent
-from app.agents.optimist import OptimistAgent
-from app.agents.pessimist import PessimistAgent
-from app.agents.critic import CriticAgent
-from app.agents.strategist import StrategistAgent
-from app.agents.finance import FinanceAgent
-from app.agents.risk import RiskAgent
-from app.agents.synthesizer import SynthesizerAgent
-
-AGENT_REGISTRY = {
-    "analyst": AnalystAgent,
-    "optimist": OptimistAgent,
-    "pessimist": PessimistAgent,
-    "critic": CriticAgent,
-    "strategist": StrategistAgent,
-    "finance": FinanceAgent,
-    "risk": RiskAgent,
-    "synthesizer": SynthesizerAgent,
-}
+import functools
+import importlib
+from collections.abc import Mapping
+from typing import Iterator
+
+from app.agents.specs import AGENT_SPECS, SPECS_BY_ID, AgentSpec
+
+# Public names that live in app.agents.base, imported on attribute access
+_BASE_EXPORTS = ("BaseAgent", "LLMAgent", "ConfigurableLLMAgent")
+_CLASS_NAMES = {spec.class_name: spec.agent_id for spec in AGENT_SPECS}
+
+
+@functools.lru_cache(maxsize=None)
+def get_agent(agent_id: str):
+    """Return the agent class for agent_id, building it on first use."""
+    from app.agents.base import ConfigurableLLMAgent
+    return ConfigurableLLMAgent.for_spec(SPECS_BY_ID[agent_id])
+
+
+class _AgentRegistry(Mapping):
+    """Read-only agent_id -> class mapping that builds agents on lookup."""
+
+    def __getitem__(self, agent_id: str):
+        return get_agent(agent_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SPECS_BY_ID)
+
+    def __len__(self) -> int:
+        return len(SPECS_BY_ID)
+
+    def copy(self) -> dict:
+        return dict(self)
+
+
+AGENT_REGISTRY = _AgentRegistry()
+
+
+def __getattr__(name: str):
+    if name in _BASE_EXPORTS:
+        value = getattr(importlib.import_module("app.agents.base"), name)
+    elif name in _CLASS_NAMES:
+        value = get_agent(_CLASS_NAMES[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "BaseAgent",
     "LLMAgent",
+    "ConfigurableLLMAgent",
+    "AgentSpec",
+    "AGENT_SPECS",
     "AnalystAgent",
     "OptimistAgent",
     "PessimistAgent",
@@ -35,4 +69,5 @@ __all__ = [
     "RiskAgent",
     "SynthesizerAgent",
     "AGENT_REGISTRY",
+    "get_agent",
 ]
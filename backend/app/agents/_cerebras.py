@@ -0,0 +1,94 @@
+"""
+Shared Cerebras clients
+One client, and so one connection pool, per API key for the whole process
+"""
+
+import asyncio
+import functools
+from collections import OrderedDict
+from typing import Set
+
+import httpx
+from cerebras.cloud.sdk import AsyncCerebras, DefaultAsyncHttpxClient
+
+from app.agents.cache import key_fingerprint
+from app.config import settings
+
+# Clients for user-supplied API keys, keyed by a fingerprint of the key and
+# ordered least recently used first. Evicted clients are closed so their
+# connection pools are released; a client evicted mid-debate loses its
+# connections, so keep this above the expected number of concurrent keys.
+MAX_OVERRIDE_CLIENTS = 16
+_override_clients: "OrderedDict[str, AsyncCerebras]" = OrderedDict()
+# Pending close() tasks for evicted clients, kept so they are not collected
+_closing: Set[asyncio.Task] = set()
+
+
+def _new_client(api_key: str) -> AsyncCerebras:
+    # The SDK's default transport already speaks HTTP/2, so a debate's agent
+    # streams share one connection; keeping idle connections for longer than
+    # httpx's 5 second default lets the next round or turn reuse it warm
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=settings.CEREBRAS_KEEPALIVE_SECONDS,
+        ),
+    )
+    # The SDK's warm-up opens and closes a separate sync client, which would
+    # block the event loop without warming this client's own pool
+    return AsyncCerebras(api_key=api_key, http_client=http_client, warm_tcp_connection=False)
+
+
+@functools.lru_cache(maxsize=1)
+def _server_client(api_key: str) -> AsyncCerebras:
+    return _new_client(api_key)
+
+
+def _close_later(client: AsyncCerebras) -> None:
+    task = asyncio.get_running_loop().create_task(client.close())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def _override_client(api_key: str) -> AsyncCerebras:
+    fingerprint = key_fingerprint(api_key)
+    client = _override_clients.get(fingerprint)
+    if client is not None:
+        _override_clients.move_to_end(fingerprint)
+        return client
+
+    client = _new_client(api_key)
+    _override_clients[fingerprint] = client
+    while len(_override_clients) > MAX_OVERRIDE_CLIENTS:
+        _, evicted = _override_clients.popitem(last=False)
+        _close_later(evicted)
+    return client
+
+
+def get_cerebras_client(api_key: str | None = None) -> AsyncCerebras:
+    """
+    Return the shared Cerebras client for an API key.
+
+    Agents using the same key share one client, and with it one connection
+    pool, instead of each paying for its own TCP/TLS setup. The server key's
+    client lives for the whole process; clients for user-supplied keys are
+    kept in a small LRU and closed when evicted.
+    """
+    if api_key and api_key != settings.CEREBRAS_API_KEY:
+        return _override_client(api_key)
+    if not settings.CEREBRAS_API_KEY:
+        raise ValueError("CEREBRAS_API_KEY environment variable not set")
+    return _server_client(settings.CEREBRAS_API_KEY)
+
+
+async def close_cerebras_clients() -> None:
+    """Close every cached Cerebras client; used at application shutdown."""
+    while _override_clients:
+        _, client = _override_clients.popitem()
+        await client.close()
+    if _server_client.cache_info().currsize:
+        await _server_client(settings.CEREBRAS_API_KEY).close()
+        _server_client.cache_clear()
+    if _closing:
+        await asyncio.gather(*_closing, return_exceptions=True)
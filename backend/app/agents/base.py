@@ -1,7 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, AsyncGenerator
+from typing import Dict, Any, Optional, List, AsyncGenerator, Deque, Type
+from collections import deque
 from datetime import datetime
+import asyncio
+import functools
 import os
+import time
+from types import SimpleNamespace
+
+from app.agents._cerebras import get_cerebras_client
+from app.agents.cache import CachedResponse, key_fingerprint, response_cache
+from app.agents.specs import AgentSpec
+from app.config import settings
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+
+
+@functools.lru_cache(maxsize=None)
+def _read_prompt_cached(path: str) -> str:
+    """Read a prompt file once; prompts are immutable at runtime."""
+    with open(path, 'r') as f:
+        return f.read()
 
 
 class BaseAgent(ABC):
@@ -17,15 +36,16 @@ class BaseAgent(ABC):
         self.status = "idle"
         self.metadata: Dict[str, Any] = {}
         self.system_prompt = self._load_prompt(prompt_file) if prompt_file else ""
+        # Constant message prefixes; each message copies one and fills the rest
+        self._token_base = {"type": "agent_token", "agentId": agent_id}
+        self._metrics_base = {"type": "agent_metrics", "agentId": agent_id}
+        self._done_base = {"type": "agent_done", "agentId": agent_id}
 
     def _load_prompt(self, prompt_file: str) -> str:
         """Load system prompt from file."""
         try:
             # Look in prompts directory relative to this file
-            prompts_dir = os.path.join(os.path.dirname(__file__), "prompts")
-            full_path = os.path.join(prompts_dir, prompt_file)
-            with open(full_path, 'r') as f:
-                return f.read()
+            return _read_prompt_cached(os.path.join(PROMPTS_DIR, prompt_file))
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt file not found: {prompt_file}")
         except Exception as e:
@@ -33,12 +53,10 @@ class BaseAgent(ABC):
 
     def _create_token_message(self, content: str) -> Dict[str, Any]:
         """Create a standardized agent token message."""
-        return {
-            "type": "agent_token",
-            "agentId": self.agent_id,
-            "content": content,
-            "timestamp": int(datetime.now().timestamp() * 1000)
-        }
+        message = self._token_base.copy()
+        message["content"] = content
+        message["timestamp"] = time.time_ns() // 1_000_000
+        return message
 
     def _create_metrics_message(
         self,
@@ -47,26 +65,32 @@ class BaseAgent(ABC):
         prompt_tokens: int = 0,
         completion_tokens: int = 0,
         completion_time: float = 0,
+        cached_tokens: int = 0,
+        cached: bool = False,
     ) -> Dict[str, Any]:
-        """Create a standardized agent metrics message with token usage."""
-        return {
-            "type": "agent_metrics",
-            "agentId": self.agent_id,
-            "tokensPerSecond": tokens_per_second,
-            "totalTokens": total_tokens,
-            "promptTokens": prompt_tokens,
-            "completionTokens": completion_tokens,
-            "completionTime": completion_time,
-            "timestamp": int(datetime.now().timestamp() * 1000)
-        }
+        """
+        Create a standardized agent metrics message with token usage.
+
+        cached_tokens is the part of prompt_tokens served from Cerebras' prompt
+        cache. cached marks a response replayed from our own response cache,
+        whose usage is that of the original request rather than tokens spent now.
+        """
+        message = self._metrics_base.copy()
+        message["tokensPerSecond"] = tokens_per_second
+        message["totalTokens"] = total_tokens
+        message["promptTokens"] = prompt_tokens
+        message["completionTokens"] = completion_tokens
+        message["completionTime"] = completion_time
+        message["cachedTokens"] = cached_tokens
+        message["cached"] = cached
+        message["timestamp"] = time.time_ns() // 1_000_000
+        return message
 
     def _create_done_message(self) -> Dict[str, Any]:
         """Create a standardized agent done message to signal end of stream."""
-        return {
-            "type": "agent_done",
-            "agentId": self.agent_id,
-            "timestamp": int(datetime.now().timestamp() * 1000)
-        }
+        message = self._done_base.copy()
+        message["timestamp"] = time.time_ns() // 1_000_000
+        return message
 
     @abstractmethod
     async def process(self, input_data: Any) -> Dict[str, Any]:
@@ -129,11 +153,28 @@ class LLMAgent(BaseAgent):
     Base class for LLM-powered agents using Cerebras API.
     """
 
+    # Streamed tokens are coalesced into one agent_token message per batch:
+    # flushed after this many tokens or once this many seconds have passed
+    TOKEN_BATCH_SIZE = settings.TOKEN_BATCH_SIZE
+    TOKEN_FLUSH_INTERVAL = settings.TOKEN_FLUSH_MS / 1000
+
     def __init__(self, agent_id: str, name: str, description: str = "",
-                 model: str = "llama3.1-8b", prompt_file: str = ""):
+                 model: str = "llama3.1-8b", prompt_file: str = "",
+                 api_key: str | None = None, max_tokens: int | None = None):
         super().__init__(agent_id, name, description, prompt_file)
         self.model = model
-        self.conversation_history: List[Dict[str, str]] = []
+        self.max_tokens = max_tokens
+        self.client = get_cerebras_client(api_key)
+        # Scopes cached responses to the key that paid for them
+        self._key_id = key_fingerprint(api_key or settings.CEREBRAS_API_KEY)
+        # The system message and base request params never change for an
+        # agent, so build them once; each query only adds its user message
+        self._system_msg = {"role": "system", "content": self.system_prompt}
+        self._base_params: Dict[str, Any] = {"model": model, "stream": True}
+        if max_tokens:
+            self._base_params["max_tokens"] = max_tokens
+        # Bounded so long-lived agents cannot grow it without limit
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=settings.AGENT_HISTORY_MAXLEN)
 
     async def process(self, input_data: Any) -> Dict[str, Any]:
         """Process input using LLM."""
@@ -167,6 +208,169 @@ class LLMAgent(BaseAgent):
     def get_capabilities(self) -> List[str]:
         return ["text_generation", "conversation", "analysis"]
 
+    async def stream_response(self, query: str, model_override: str = None, use_reasoning: bool = False) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream a response to the given query using Cerebras API.
+
+        Shared by every LLM agent; subclasses only supply identity, prompt
+        and capabilities.
+
+        Args:
+            query: The user's query or message
+            model_override: Optional model ID to override the default
+            use_reasoning: Whether to enable reasoning_effort for deeper analysis
+
+        Yields:
+            Dict containing agent_token messages
+        """
+        self.set_status("processing")
+        # Looked up once and reused for the token flush clock
+        loop = asyncio.get_running_loop()
+        model_to_use = model_override or self.model
+        start_time = time.perf_counter()
+        token_count = 0
+        parts = []
+        batch = []
+        last_flush = loop.time()
+
+        try:
+            cache_key = response_cache.make_key(model_to_use, self.system_prompt, query, self._key_id)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                async for msg in self._replay_cached(cached):
+                    yield msg
+                return
+
+            # Build completion params
+            params = {
+                **self._base_params,
+                "messages": [self._system_msg, {"role": "user", "content": query}],
+            }
+            if model_override:
+                params["model"] = model_override
+
+            # Stream tokens to client. Leaving the block early (round restart,
+            # client disconnect) closes the response so no more tokens are pulled
+            chunk = None
+
+            # Bound locally: these are looked up once per token otherwise
+            create_token = self._create_token_message
+            batch_size = self.TOKEN_BATCH_SIZE
+            flush_interval = self.TOKEN_FLUSH_INTERVAL
+            clock = loop.time
+
+            stream = await self.client.chat.completions.create(**params)
+            async with stream:
+                async for chunk in stream:
+                    token = chunk.choices[0].delta.content
+                    if token:
+                        batch.append(token)
+                        now = clock()
+                        if len(batch) >= batch_size or now - last_flush >= flush_interval:
+                            # Counted per flush rather than per token; the count
+                            # only matters when the API sends no usage
+                            token_count += len(batch)
+                            content = "".join(batch)
+                            parts.append(content)
+                            yield create_token(content)
+                            batch.clear()
+                            last_flush = now
+
+            if batch:
+                token_count += len(batch)
+                content = "".join(batch)
+                parts.append(content)
+                yield create_token(content)
+
+            # Usage and timing are only sent on the final chunk
+            final_usage = getattr(chunk, 'usage', None)
+            final_time_info = getattr(chunk, 'time_info', None)
+            metrics = self._build_metrics(final_usage, final_time_info, token_count, start_time)
+            response_cache.put(cache_key, CachedResponse(tuple(parts), metrics))
+            yield self._create_metrics_message(**metrics)
+
+            # Signal completion
+            yield self._create_done_message()
+
+        except Exception as e:
+            # Yield error as token
+            yield self._create_token_message(f"[Error: {str(e)}]")
+            yield self._create_done_message()
+
+        finally:
+            self.set_status("idle")
+
+    @staticmethod
+    def _build_metrics(final_usage: Any, final_time_info: Any,
+                       token_count: int, start_time: float) -> Dict[str, Any]:
+        """
+        Build the metrics payload for a finished stream.
+
+        Prefers the API's time_info.completion_time (actual inference time) and
+        falls back to elapsed perf_counter time since start_time; counts our own tokens when usage is missing.
+        cached_tokens reports prompt tokens Cerebras served from its prefix cache.
+        """
+        usage = final_usage or SimpleNamespace(
+            prompt_tokens=0, completion_tokens=token_count, total_tokens=token_count
+        )
+        prompt_details = getattr(usage, 'prompt_tokens_details', None)
+        completion_time = (getattr(final_time_info, 'completion_time', None)
+                           or time.perf_counter() - start_time)
+        tokens_per_second = usage.completion_tokens / completion_time if completion_time > 0 else 0.0
+
+        return {
+            "tokens_per_second": tokens_per_second,
+            "total_tokens": usage.total_tokens,
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "completion_time": completion_time,
+            "cached_tokens": getattr(prompt_details, 'cached_tokens', None) or 0,
+        }
+
+    async def _replay_cached(self, cached: CachedResponse) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Replay a cached response with the same token/metrics/done contract as a live stream.
+
+        Cached tokens are the already-coalesced chunks, so a hit sends the same
+        number of agent_token messages as the original stream.
+        """
+        for content in cached.tokens:
+            yield self._create_token_message(content)
+        yield self._create_metrics_message(**cached.metrics, cached=True)
+        yield self._create_done_message()
+
     def clear_history(self) -> None:
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
+
+
+class ConfigurableLLMAgent(LLMAgent):
+    """
+    LLM agent whose identity, prompt and capabilities come from an AgentSpec.
+
+    Concrete agent classes are built with for_spec() so the registry still
+    maps agent ids to classes.
+    """
+
+    spec: AgentSpec
+
+    def __init__(self, api_key: str | None = None):
+        spec = self.spec
+        super().__init__(
+            agent_id=spec.agent_id,
+            name=spec.name,
+            description=spec.description,
+            prompt_file=spec.prompt_file,
+            model=spec.model,
+            api_key=api_key,
+            max_tokens=spec.max_tokens,
+        )
+        self.color = spec.color
+
+    def get_capabilities(self) -> List[str]:
+        return list(self.spec.capabilities)
+
+    @classmethod
+    def for_spec(cls, spec: AgentSpec) -> Type["ConfigurableLLMAgent"]:
+        """Build the agent class for a spec."""
+        return type(spec.class_name, (cls,), {"spec": spec, "__doc__": spec.description})
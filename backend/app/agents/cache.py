@@ -0,0 +1,87 @@
+"""
+Response cache for MindGlass agents
+Replays completed LLM responses for repeated (API key, model, system prompt, query) inputs
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+from app.config import settings
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Return a stable, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A completed agent response: its coalesced token chunks and final metrics."""
+    tokens: Tuple[str, ...]
+    metrics: Dict[str, Any]
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of completed agent responses.
+
+    Keys are exact-match hashes of model, system prompt and query, so a hit
+    skips the whole Cerebras round-trip. They are scoped by API key
+    fingerprint, so a response paid for by one key is never replayed to a
+    caller using another. Entries expire ttl seconds after they are stored
+    (0 keeps them until evicted). A max_entries of 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (monotonic expiry time or None, response)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], CachedResponse]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, query: str, key_id: str = "") -> str:
+        """Build the cache key for a request; key_id is the API key fingerprint."""
+        digest = hashlib.sha256()
+        for part in (key_id, model, system_prompt, query):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached response for key, marking it recently used."""
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """Store a response, evicting the least recently used one if full."""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        self._entries[key] = (expires_at, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by all agents
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL,
+)
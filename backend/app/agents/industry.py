@@ -3,131 +3,43 @@ Industry-Specific Agent Factory for MindGlass
 Creates specialized agents based on industry selection
 """
 
-from typing import Dict, Any, AsyncGenerator, Optional, Type
-from cerebras.cloud.sdk import Cerebras
+import functools
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple, Type
 
-from app.agents.base import LLMAgent
-from app.config import settings
+from app.agents.specs import AGENT_SPECS, AgentSpec
 
+if TYPE_CHECKING:
+    from app.agents.base import LLMAgent
 
+
+@functools.lru_cache(maxsize=None)
 def create_industry_agent_class(
     agent_id: str,
     name: str,
     description: str,
     prompt_file: str,
     color: str = "#6B7280"
-) -> Type[LLMAgent]:
+) -> Type["LLMAgent"]:
     """
     Factory function to create industry-specific agent classes.
-    """
-    class IndustryAgent(LLMAgent):
-        def __init__(self, api_key: str | None = None):
-            super().__init__(
-                agent_id=agent_id,
-                name=name,
-                description=description,
-                prompt_file=prompt_file,
-                model="llama-3.3-70b"
-            )
-            self.color = color
-            resolved_key = api_key or settings.CEREBRAS_API_KEY
-            if not resolved_key:
-                raise ValueError("CEREBRAS_API_KEY environment variable not set")
-            self.client = Cerebras(api_key=resolved_key)
-
-        async def stream_response(self, query: str, model_override: str = None, use_reasoning: bool = False) -> AsyncGenerator[Dict[str, Any], None]:
-            """Stream a response using Cerebras API."""
-            import asyncio
-            import time
-
-            self.set_status("processing")
-            model_to_use = model_override or self.model
-            start_time = time.time()
-            token_count = 0
-
-            try:
-                params = {
-                    "model": model_to_use,
-                    "messages": [
-                        {"role": "system", "content": self.system_prompt},
-                        {"role": "user", "content": query}
-                    ],
-                    "stream": True
-                }
-                stream = self.client.chat.completions.create(**params)
-
-                loop = asyncio.get_event_loop()
-
-                def get_next_chunk(iterator):
-                    try:
-                        return next(iterator)
-                    except StopIteration:
-                        return None
-
-                iterator = iter(stream)
-                final_usage = None
-                final_time_info = None
-
-                while True:
-                    chunk = await loop.run_in_executor(None, get_next_chunk, iterator)
-                    if chunk is None:
-                        break
-
-                    if hasattr(chunk, 'usage') and chunk.usage:
-                        final_usage = chunk.usage
-                    if hasattr(chunk, 'time_info') and chunk.time_info:
-                        final_time_info = chunk.time_info
-
-                    if hasattr(chunk.choices[0].delta, 'content') and chunk.choices[0].delta.content:
-                        content = chunk.choices[0].delta.content
-                        token_count += 1
-                        yield self._create_token_message(content)
-
-                completion_time = None
-                if final_time_info and hasattr(final_time_info, 'completion_time'):
-                    completion_time = final_time_info.completion_time
 
-                elapsed = None
-                if completion_time and completion_time > 0:
-                    completion_tokens_count = final_usage.completion_tokens if final_usage else token_count
-                    tokens_per_second = completion_tokens_count / completion_time
-                else:
-                    elapsed = time.time() - start_time
-                    tokens_per_second = token_count / elapsed if elapsed > 0 else 0
-
-                metrics_time = completion_time if completion_time and completion_time > 0 else (elapsed or 0)
-
-                prompt_tokens = final_usage.prompt_tokens if final_usage else 0
-                completion_tokens = final_usage.completion_tokens if final_usage else token_count
-                total_tokens = final_usage.total_tokens if final_usage else token_count
-
-                yield self._create_metrics_message(
-                    tokens_per_second=tokens_per_second,
-                    total_tokens=total_tokens,
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    completion_time=metrics_time,
-                )
-                yield self._create_done_message()
-                self.set_status("idle")
-
-            except Exception as e:
-                self.set_status("error")
-                yield {"type": "error", "agentId": self.agent_id, "error": str(e)}
-
-        async def process(self, input_data: Any) -> Dict[str, Any]:
-            return {"result": "processed", "agent_id": self.agent_id}
-
-        def get_capabilities(self):
-            return ["industry_analysis", "streaming"]
+    Cached, so the same definition always yields the same class.
+    """
+    from app.agents.base import ConfigurableLLMAgent
 
-    # Set a meaningful class name
-    IndustryAgent.__name__ = f"{agent_id.title().replace('_', '')}Agent"
-    return IndustryAgent
+    return ConfigurableLLMAgent.for_spec(AgentSpec(
+        agent_id=agent_id,
+        name=name,
+        description=description,
+        prompt_file=prompt_file,
+        color=color,
+        capabilities=("industry_analysis", "streaming"),
+    ))
 
 
-# Industry-specific agent definitions
-INDUSTRY_AGENTS = {
+# Industry-specific agent definitions, read-only once defined
+INDUSTRY_AGENTS: Mapping[str, Dict[str, Dict[str, str]]] = MappingProxyType({
     # SaaS / Software
     "saas": {
         "saas_metrics": {
@@ -218,109 +130,83 @@ INDUSTRY_AGENTS = {
             "color": "#22C55E"  # Green
         }
     }
+})
+
+
+_BASE_AGENT_IDS: Tuple[str, ...] = tuple(spec.agent_id for spec in AGENT_SPECS)
+
+# Base agent info (names, colors) shown by the frontend, from the agent specs
+_BASE_AGENT_INFO: Dict[str, Dict[str, str]] = {
+    spec.agent_id: {"name": spec.name, "color": spec.color} for spec in AGENT_SPECS
 }
 
 
-def get_industry_agent_registry(industry: Optional[str] = None) -> Dict[str, Type[LLMAgent]]:
-    """
-    Get agent registry, optionally including industry-specific agents.
-    
-    When an industry is specified, replaces the generic 'finance' and 'risk' agents
-    with industry-specific specialists.
-    """
+def _build_agent_ids(industry: str) -> Tuple[str, ...]:
+    # The industry's first specialist replaces finance, the second replaces risk
+    first, second = list(INDUSTRY_AGENTS[industry])[:2]
+    replacements = {"finance": first, "risk": second}
+    return tuple(replacements.get(agent_id, agent_id) for agent_id in _BASE_AGENT_IDS)
+
+
+def _build_agent_info(industry: str) -> Mapping[str, Dict[str, str]]:
+    info = {
+        agent_id: agent_info for agent_id, agent_info in _BASE_AGENT_INFO.items()
+        if agent_id not in ("finance", "risk")
+    }
+    for agent_id, config in INDUSTRY_AGENTS[industry].items():
+        info[agent_id] = {"name": config["name"], "color": config["color"]}
+    return MappingProxyType(info)
+
+
+# Per-industry lookups, computed once at import
+_INDUSTRY_AGENT_IDS = {industry: _build_agent_ids(industry) for industry in INDUSTRY_AGENTS}
+_INDUSTRY_AGENT_INFO = {industry: _build_agent_info(industry) for industry in INDUSTRY_AGENTS}
+_BASE_AGENT_INFO_VIEW = MappingProxyType(_BASE_AGENT_INFO)
+
+
+@functools.lru_cache(maxsize=None)
+def _industry_registry(industry: str) -> Mapping[str, Type["LLMAgent"]]:
     from app.agents import AGENT_REGISTRY
-    
-    # Start with base registry
-    registry = AGENT_REGISTRY.copy()
-    
-    if not industry or industry not in INDUSTRY_AGENTS:
-        return registry
-    
-    # Get industry-specific agents
-    industry_agents = INDUSTRY_AGENTS[industry]
-    
-    # Create and add industry-specific agent classes
-    for agent_id, config in industry_agents.items():
-        agent_class = create_industry_agent_class(
+
+    registry = dict(AGENT_REGISTRY)
+    for agent_id, config in INDUSTRY_AGENTS[industry].items():
+        registry[agent_id] = create_industry_agent_class(
             agent_id=agent_id,
             name=config["name"],
             description=config["description"],
             prompt_file=config["prompt_file"],
             color=config["color"]
         )
-        registry[agent_id] = agent_class
-    
-    return registry
+    return MappingProxyType(registry)
 
 
-def get_industry_agent_ids(industry: Optional[str] = None) -> list:
+def get_industry_agent_registry(industry: Optional[str] = None) -> Mapping[str, Type["LLMAgent"]]:
+    """
+    Get agent registry, optionally including industry-specific agents.
+
+    When an industry is specified, adds its specialists, which take the place
+    of the generic 'finance' and 'risk' agents. The registry for each industry
+    is built once and shared, so it is read-only.
+    """
+    if not industry or industry not in INDUSTRY_AGENTS:
+        from app.agents import AGENT_REGISTRY
+        return AGENT_REGISTRY
+    return _industry_registry(industry)
+
+
+def get_industry_agent_ids(industry: Optional[str] = None) -> List[str]:
     """
     Get the list of agent IDs to use for a given industry.
-    
+
     For industry-specific runs, replaces finance and risk with industry specialists.
     """
-    base_agents = ["analyst", "optimist", "pessimist", "critic", "strategist", "finance", "risk", "synthesizer"]
-    
-    if not industry or industry not in INDUSTRY_AGENTS:
-        return base_agents
-    
-    # Get industry-specific agent IDs
-    industry_agent_ids = list(INDUSTRY_AGENTS[industry].keys())
-    
-    # Replace finance and risk with industry-specific agents
-    result = []
-    for agent_id in base_agents:
-        if agent_id == "finance":
-            result.append(industry_agent_ids[0])  # First industry agent
-        elif agent_id == "risk":
-            result.append(industry_agent_ids[1])  # Second industry agent
-        else:
-            result.append(agent_id)
-    
-    return result
+    return list(_INDUSTRY_AGENT_IDS.get(industry, _BASE_AGENT_IDS))
 
 
 # Export industry agent info for frontend
-def get_industry_agent_info(industry: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+def get_industry_agent_info(industry: Optional[str] = None) -> Mapping[str, Dict[str, str]]:
     """
     Get agent info (names, colors) for the selected industry.
-    Used by frontend to update agent display.
+    Used by frontend to update agent display. The result is shared and read-only.
     """
-    from app.agents import AGENT_REGISTRY
-    
-    # Base agent info
-    base_info = {
-        "analyst": {"name": "Analyst", "color": "#3B82F6"},
-        "optimist": {"name": "Optimist", "color": "#22C55E"},
-        "pessimist": {"name": "Pessimist", "color": "#6B7280"},
-        "critic": {"name": "Critic", "color": "#EF4444"},
-        "strategist": {"name": "Strategist", "color": "#8B5CF6"},
-        "finance": {"name": "Finance", "color": "#EAB308"},
-        "risk": {"name": "Risk", "color": "#F97316"},
-        "synthesizer": {"name": "Synthesizer", "color": "#06B6D4"},
-    }
-    
-    if not industry or industry not in INDUSTRY_AGENTS:
-        return base_info
-    
-    # Copy base info
-    result = base_info.copy()
-    
-    # Get industry-specific agents
-    industry_agents = INDUSTRY_AGENTS[industry]
-    agent_ids = get_industry_agent_ids(industry)
-    
-    # Add industry-specific agent info
-    for agent_id, config in industry_agents.items():
-        result[agent_id] = {
-            "name": config["name"],
-            "color": config["color"]
-        }
-    
-    # Remove replaced base agents
-    if "finance" in result and agent_ids[5] != "finance":
-        del result["finance"]
-    if "risk" in result and agent_ids[6] != "risk":
-        del result["risk"]
-    
-    return result
+    return _INDUSTRY_AGENT_INFO.get(industry, _BASE_AGENT_INFO_VIEW)
@@ -0,0 +1,136 @@
+"""
+Agent definitions for MindGlass
+Every debate agent is the same LLM agent with a different spec
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """Identity, prompt and presentation of one debate agent."""
+    agent_id: str
+    name: str
+    description: str
+    prompt_file: str
+    color: str
+    capabilities: Tuple[str, ...]
+    model: str = "llama-3.3-70b"
+    max_tokens: Optional[int] = None  # Completion cap; None leaves it to the API
+
+    @property
+    def class_name(self) -> str:
+        """Class name for agents built from this spec, e.g. AnalystAgent."""
+        return f"{self.agent_id.title().replace('_', '')}Agent"
+
+
+AGENT_SPECS: Tuple[AgentSpec, ...] = (
+    AgentSpec(
+        agent_id="analyst",
+        name="Analyst",
+        description="Breaks down complex problems and provides structured analysis",
+        prompt_file="analyst.txt",
+        color="#5F8787",
+        capabilities=(
+            "problem_breakdown",
+            "factual_analysis",
+            "structured_reasoning",
+            "multi_agent_debate",
+        ),
+    ),
+    AgentSpec(
+        agent_id="optimist",
+        name="Optimist",
+        description="Identifies opportunities, best-case scenarios, and positive outcomes",
+        prompt_file="optimist.txt",
+        color="#E78A53",
+        capabilities=(
+            "opportunity_identification",
+            "positive_scenario_planning",
+            "upside_analysis",
+            "growth_potential_assessment",
+        ),
+    ),
+    AgentSpec(
+        agent_id="pessimist",
+        name="Pessimist",
+        description="Identifies risks, blockers, worst-case scenarios, and potential failures",
+        prompt_file="pessimist.txt",
+        color="#FBCB97",
+        capabilities=(
+            "risk_identification",
+            "blocker_analysis",
+            "worst_case_scenario_planning",
+            "failure_mode_assessment",
+        ),
+    ),
+    AgentSpec(
+        agent_id="critic",
+        name="Critic",
+        description="Challenges assumptions, questions logic, and plays devil's advocate",
+        prompt_file="critic.txt",
+        color="#EF4444",
+        capabilities=(
+            "assumption_challenging",
+            "logical_analysis",
+            "devils_advocacy",
+            "reasoning_validation",
+        ),
+    ),
+    AgentSpec(
+        agent_id="strategist",
+        name="Strategist",
+        description="Focuses on long-term planning, big picture thinking, and strategic positioning",
+        prompt_file="strategist.txt",
+        color="#A855F7",
+        capabilities=(
+            "strategic_planning",
+            "long_term_positioning",
+            "systems_thinking",
+            "trend_analysis",
+        ),
+    ),
+    AgentSpec(
+        agent_id="finance",
+        name="Finance",
+        description="Analyzes budget, ROI, cost-benefit, and financial implications",
+        prompt_file="finance.txt",
+        color="#EAB308",
+        capabilities=(
+            "financial_analysis",
+            "roi_calculation",
+            "cost_benefit_analysis",
+            "budget_planning",
+        ),
+    ),
+    AgentSpec(
+        agent_id="risk",
+        name="Risk",
+        description="Assesses legal, safety, compliance, and operational risks",
+        prompt_file="risk.txt",
+        color="#B91C1C",
+        capabilities=(
+            "risk_assessment",
+            "compliance_analysis",
+            "safety_evaluation",
+            "operational_risk_management",
+        ),
+    ),
+    AgentSpec(
+        agent_id="synthesizer",
+        name="Synthesizer",
+        description="Creates final consensus answer by integrating all agent perspectives",
+        prompt_file="synthesizer.txt",
+        color="#C1C1C1",
+        capabilities=(
+            "consensus_building",
+            "perspective_integration",
+            "summary_synthesis",
+            "recommendation_formation",
+        ),
+    ),
+)
+
+# agent_id -> spec for the core debate agents
+SPECS_BY_ID = {spec.agent_id: spec for spec in AGENT_SPECS}
@@ -22,20 +22,52 @@ class Settings:
 
     # CORS
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")
-    ALLOWED_ORIGINS: list = [
+    # Exact origins; dict.fromkeys drops FRONTEND_URL when it repeats a default
+    ALLOWED_ORIGINS: list = list(dict.fromkeys([
         FRONTEND_URL,
         "http://localhost:5173",
         "http://127.0.0.1:5173",
         "https://prism-cerebras.vercel.app",
         "https://frontend-nine-iota-86.vercel.app",  # Vercel deployment
-        "https://*.vercel.app",  # Allow all Vercel preview deployments
-    ]
+    ]))
+    # CORSMiddleware does not glob allow_origins, so Vercel preview
+    # deployments are matched by one regex (compiled once by the middleware)
+    ALLOWED_ORIGIN_REGEX: str = r"https://[a-z0-9-]+(\.[a-z0-9-]+)*\.vercel\.app"
 
     # WebSocket
     WS_ENDPOINT: str = "/ws/debate"
+    # Client messages longer than this many characters are rejected unparsed
+    WS_MAX_MESSAGE_CHARS: int = int(os.getenv("WS_MAX_MESSAGE_CHARS", "262144"))
 
     # Cerebras API (for future use)
     CEREBRAS_API_KEY: str = os.getenv("CEREBRAS_API_KEY", "")
+    # Seconds an idle connection to the Cerebras API is kept for reuse
+    CEREBRAS_KEEPALIVE_SECONDS: float = float(os.getenv("CEREBRAS_KEEPALIVE_SECONDS", "60"))
+
+    # Streamed tokens are coalesced into one agent_token message, flushed after
+    # TOKEN_BATCH_SIZE tokens or TOKEN_FLUSH_MS milliseconds, whichever is first
+    TOKEN_BATCH_SIZE: int = int(os.getenv("TOKEN_BATCH_SIZE", "8"))
+    TOKEN_FLUSH_MS: float = float(os.getenv("TOKEN_FLUSH_MS", "10"))
+
+    # Messages each agent keeps in conversation_history (oldest dropped first)
+    AGENT_HISTORY_MAXLEN: int = int(os.getenv("AGENT_HISTORY_MAXLEN", "20"))
+
+    # Messages buffered between a round's agent streams and the websocket
+    # sender; agents wait when it is full (0 means unbounded)
+    STREAM_QUEUE_SIZE: int = int(os.getenv("STREAM_QUEUE_SIZE", "256"))
+    # Seconds a cancelled stream gets to unwind before the socket moves on
+    STREAM_CANCEL_TIMEOUT_SECONDS: float = float(os.getenv("STREAM_CANCEL_TIMEOUT_SECONDS", "5"))
+
+    # For clients that opt in with batchTokens, agent_token messages are sent
+    # in frames of up to WS_BATCH_MAX_TOKENS messages, held at most
+    # WS_BATCH_LINGER_MS milliseconds (0 only batches what is already queued)
+    WS_BATCH_MAX_TOKENS: int = int(os.getenv("WS_BATCH_MAX_TOKENS", "16"))
+    WS_BATCH_LINGER_MS: float = float(os.getenv("WS_BATCH_LINGER_MS", "15"))
+
+    # Completed agent responses kept for exact-match replay (0 disables)
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+    # Seconds a cached response stays valid (0 keeps it until evicted)
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
 
 
 # Create settings instance
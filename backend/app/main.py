@@ -3,41 +3,61 @@ MindGlass Backend - FastAPI Application
 WebSocket-enabled real-time debate visualization platform
 """
 
-import json
 import asyncio
-import uuid
+import logging
 import re
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import time
+from secrets import token_hex
+from contextlib import asynccontextmanager
+import orjson
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from pydantic import ValidationError
 
 from app.orchestrator.debate import DebateOrchestrator
-from app.websocket.messages import create_error
+from app.websocket.batching import forward_messages
+from app.websocket.messages import (
+    create_error,
+    describe_invalid_message,
+    encode_message,
+    parse_inbound_message,
+)
 from app.config import settings
 from app.agents.industry import get_industry_agent_info, INDUSTRY_AGENTS
 
 # Load environment variables
 load_dotenv()
 
+# Timestamps are formatted by logging only for records that are emitted
+logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s")
+logger = logging.getLogger("mindglass.ws")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the shared Cerebras clients on shutdown."""
+    yield
+    from app.agents._cerebras import close_cerebras_clients
+    await close_cerebras_clients()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="MindGlass API",
     version="1.0.0",
-    description="Real-time debate visualization platform"
+    description="Real-time debate visualization platform",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware configuration - using centralized settings
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",
-        "http://127.0.0.1:5173",
-        "https://prism-cerebras.vercel.app",
-        "https://frontend-nine-iota-86.vercel.app",
-    ],
-    allow_origin_regex=r"https://.*\.vercel\.app",  # Allow all Vercel preview deployments
+    allow_origins=settings.ALLOWED_ORIGINS,
+    allow_origin_regex=settings.ALLOWED_ORIGIN_REGEX,  # Vercel preview deployments
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -46,9 +66,26 @@ app.add_middleware(
 # Initialize orchestrator for multi-agent debates
 orchestrator = DebateOrchestrator()
 
+
+_API_KEY_RE = re.compile(r"^csk-[A-Za-z0-9]{10,}$")
+
+
 def is_valid_api_key(api_key: str) -> bool:
     """Basic format validation for Cerebras API keys."""
-    return bool(re.match(r"^csk-[A-Za-z0-9]{10,}$", api_key))
+    return _API_KEY_RE.match(api_key) is not None
+
+
+async def cancel_stream(task: asyncio.Task, kind: str, stream_id: str | None) -> None:
+    """Cancel a running stream and give it a bounded time to unwind."""
+    task.cancel()
+    # Let the old run finish unwinding so two runs never share the socket,
+    # but don't let a stuck one stop the receive loop
+    done, _ = await asyncio.wait({task}, timeout=settings.STREAM_CANCEL_TIMEOUT_SECONDS)
+    if not done:
+        logger.warning(
+            "Prior %s id=%s still unwinding after %.1fs; starting the new run anyway",
+            kind, stream_id, settings.STREAM_CANCEL_TIMEOUT_SECONDS,
+        )
 
 
 @app.get("/api/health")
@@ -60,29 +97,41 @@ async def health_check():
     }
 
 
-@app.get("/api/industries")
-async def get_industries():
-    """Get list of available industries and their specialized agents"""
-    return {
-        "industries": list(INDUSTRY_AGENTS.keys()),
-        "agents": {
-            industry: {
-                agent_id: {
-                    "name": config["name"],
-                    "color": config["color"],
-                    "description": config["description"]
-                }
-                for agent_id, config in agents.items()
+# The industry table is static, so the response body is encoded once at import
+_INDUSTRIES_BODY = orjson.dumps({
+    "industries": list(INDUSTRY_AGENTS.keys()),
+    "agents": {
+        industry: {
+            agent_id: {
+                "name": config["name"],
+                "color": config["color"],
+                "description": config["description"]
             }
-            for industry, agents in INDUSTRY_AGENTS.items()
+            for agent_id, config in agents.items()
         }
+        for industry, agents in INDUSTRY_AGENTS.items()
     }
+})
+
+
+@app.get("/api/industries")
+async def get_industries():
+    """Get list of available industries and their specialized agents"""
+    return Response(content=_INDUSTRIES_BODY, media_type="application/json")
+
+
+# Per-industry agent info bodies; "any" and unknown industries get the base agents
+_AGENT_INFO_BODIES = {
+    industry: orjson.dumps(dict(get_industry_agent_info(industry))) for industry in INDUSTRY_AGENTS
+}
+_BASE_AGENT_INFO_BODY = orjson.dumps(dict(get_industry_agent_info(None)))
 
 
 @app.get("/api/agents/{industry}")
 async def get_agents_for_industry(industry: str):
     """Get agent info for a specific industry"""
-    return get_industry_agent_info(industry if industry != "any" else None)
+    body = _AGENT_INFO_BODIES.get(industry, _BASE_AGENT_INFO_BODY)
+    return Response(content=body, media_type="application/json")
 
 
 @app.websocket("/ws/debate")
@@ -92,9 +141,8 @@ async def websocket_endpoint(websocket: WebSocket):
     Handles start_debate messages and streams agent responses.
     """
     await websocket.accept()
-    client_id = str(uuid.uuid4())
-    connection_time = datetime.now().isoformat()
-    print(f"[{connection_time}] WebSocket connected - Client: {client_id}")
+    client_id = token_hex(8)
+    logger.info("WebSocket connected - Client: %s", client_id)
 
     stream_task: asyncio.Task | None = None
     stream_id: str | None = None
@@ -104,7 +152,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
     async def safe_send(payload: dict):
         async with send_lock:
-            await websocket.send_json(payload)
+            await websocket.send_text(encode_message(payload))
 
     async def run_stream(
         query: str,
@@ -113,24 +161,30 @@ async def websocket_endpoint(websocket: WebSocket):
         selected_agents: list = None,
         industry: str = "",
         api_key: str | None = None,
+        compact: bool = False,
+        batch: bool = False,
     ):
         try:
-            print(f"[{datetime.now().isoformat()}] Stream start id={stream_id} model={model} industry={industry or 'generic'}")
-            async for token in orchestrator.stream_debate(
-                query,
-                model,
-                previous_context,
-                selected_agents,
-                industry,
-                api_key_override=api_key,
-            ):
-                await safe_send(token)
-            print(f"[{datetime.now().isoformat()}] Debate complete")
+            logger.info("Stream start id=%s model=%s industry=%s", stream_id, model, industry or "generic")
+            await forward_messages(
+                orchestrator.stream_debate(
+                    query,
+                    model,
+                    previous_context,
+                    selected_agents,
+                    industry,
+                    api_key_override=api_key,
+                ),
+                safe_send,
+                compact=compact,
+                batch=batch,
+            )
+            logger.info("Debate complete")
         except asyncio.CancelledError:
-            print(f"[{datetime.now().isoformat()}] Debate stream cancelled")
+            logger.info("Debate stream cancelled")
         except Exception as e:
             error_msg = f"Error during streaming: {str(e)}"
-            print(f"[{datetime.now().isoformat()}] {error_msg}")
+            logger.error(error_msg)
             try:
                 await safe_send(create_error(error_msg))
             except Exception:
@@ -143,24 +197,30 @@ async def websocket_endpoint(websocket: WebSocket):
         selected_agents: list = None,
         industry: str = "",
         api_key: str | None = None,
+        compact: bool = False,
+        batch: bool = False,
     ):
         try:
-            print(f"[{datetime.now().isoformat()}] Branching start id={branch_stream_id} model={model} industry={industry or 'generic'}")
-            async for token in orchestrator.stream_branching_debate(
-                query,
-                model,
-                previous_context,
-                selected_agents,
-                industry,
-                api_key_override=api_key,
-            ):
-                await safe_send(token)
-            print(f"[{datetime.now().isoformat()}] Branching complete")
+            logger.info("Branching start id=%s model=%s industry=%s", branch_stream_id, model, industry or "generic")
+            await forward_messages(
+                orchestrator.stream_branching_debate(
+                    query,
+                    model,
+                    previous_context,
+                    selected_agents,
+                    industry,
+                    api_key_override=api_key,
+                ),
+                safe_send,
+                compact=compact,
+                batch=batch,
+            )
+            logger.info("Branching complete")
         except asyncio.CancelledError:
-            print(f"[{datetime.now().isoformat()}] Branching stream cancelled")
+            logger.info("Branching stream cancelled")
         except Exception as e:
             error_msg = f"Error during branching: {str(e)}"
-            print(f"[{datetime.now().isoformat()}] {error_msg}")
+            logger.error(error_msg)
             try:
                 await safe_send(create_error(error_msg))
             except Exception:
@@ -171,20 +231,30 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             # Receive message
             data = await websocket.receive_text()
-            message = json.loads(data)
-            log_message = message.copy()
-            if "apiKey" in log_message:
-                log_message["apiKey"] = "***redacted***"
-            print(f"[{datetime.now().isoformat()}] WS recv: {log_message}")
+            if len(data) > settings.WS_MAX_MESSAGE_CHARS:
+                logger.warning("Rejected message: %d chars", len(data))
+                await safe_send(create_error("Message too large"))
+                continue
+            try:
+                message = parse_inbound_message(data)
+            except ValidationError as e:
+                error_text = describe_invalid_message(e)
+                logger.warning("Rejected message: %s", error_text)
+                await safe_send(create_error(error_text))
+                continue
+            # apiKey is a SecretStr, so the key is masked in this log line
+            logger.debug("WS recv: %r", message)
 
             # Handle start_debate message
-            if message.get("type") == "start_debate":
-                query = message.get("query", "").strip()
-                model = message.get("model", "pro")  # Default to 'pro' tier
-                previous_context = message.get("previousContext", "")  # Context from previous turns
-                selected_agents = message.get("selectedAgents", None)  # Which agents to include
-                industry = message.get("industry", "")  # Industry context for tailored advice
-                api_key = (message.get("apiKey") or "").strip() or None
+            if message.type == "start_debate":
+                query = message.query
+                model = message.model  # Defaults to 'pro' tier
+                previous_context = message.previousContext  # Context from previous turns
+                selected_agents = message.selectedAgents  # Which agents to include
+                industry = message.industry  # Industry context for tailored advice
+                api_key = message.api_key
+                compact = message.compactTokens
+                batch = message.batchTokens
 
                 if api_key and not is_valid_api_key(api_key):
                     await safe_send(
@@ -203,29 +273,33 @@ async def websocket_endpoint(websocket: WebSocket):
                     await safe_send(create_error("Query cannot be empty"))
                     continue
 
-                print(f"[{datetime.now().isoformat()}] Starting debate - Query: {query[:50]}... | Model: {model} | Agents: {selected_agents or 'all'} | Industry: {industry or 'generic'}")
+                logger.info(
+                    "Starting debate - Query: %s... | Model: %s | Agents: %s | Industry: %s",
+                    query[:50], model, selected_agents or "all", industry or "generic",
+                )
                 if previous_context:
-                    print(f"[{datetime.now().isoformat()}] Previous context length: {len(previous_context)} chars")
+                    logger.info("Previous context length: %d chars", len(previous_context))
 
                 # Cancel any existing stream
                 if stream_task and not stream_task.done():
-                    print(f"[{datetime.now().isoformat()}] Cancelling prior stream id={stream_id}")
-                    stream_task.cancel()
-                    await asyncio.sleep(0)
+                    logger.info("Cancelling prior stream id=%s", stream_id)
+                    await cancel_stream(stream_task, "debate", stream_id)
 
                 # Start streaming in the background so we can handle injects
-                stream_id = str(uuid.uuid4())
+                stream_id = token_hex(8)
                 stream_task = asyncio.create_task(
-                    run_stream(query, model, previous_context, selected_agents, industry, api_key)
+                    run_stream(query, model, previous_context, selected_agents, industry, api_key, compact, batch)
                 )
 
-            elif message.get("type") == "start_branching":
-                query = message.get("query", "").strip()
-                model = message.get("model", "pro")
-                previous_context = message.get("previousContext", "")
-                selected_agents = message.get("selectedAgents", None)
-                industry = message.get("industry", "")
-                api_key = (message.get("apiKey") or "").strip() or None
+            elif message.type == "start_branching":
+                query = message.query
+                model = message.model
+                previous_context = message.previousContext
+                selected_agents = message.selectedAgents
+                industry = message.industry
+                api_key = message.api_key
+                compact = message.compactTokens
+                batch = message.batchTokens
 
                 if api_key and not is_valid_api_key(api_key):
                     await safe_send(
@@ -243,61 +317,57 @@ async def websocket_endpoint(websocket: WebSocket):
                     await safe_send(create_error("Query cannot be empty"))
                     continue
 
-                print(
-                    f"[{datetime.now().isoformat()}] Starting branching - "
-                    f"Query: {query[:50]}... | Model: {model} | Agents: {selected_agents or 'all'} | "
-                    f"Industry: {industry or 'generic'}"
+                logger.info(
+                    "Starting branching - Query: %s... | Model: %s | Agents: %s | Industry: %s",
+                    query[:50], model, selected_agents or "all", industry or "generic",
                 )
 
                 if branch_stream_task and not branch_stream_task.done():
-                    print(f"[{datetime.now().isoformat()}] Cancelling prior branching id={branch_stream_id}")
-                    branch_stream_task.cancel()
-                    await asyncio.sleep(0)
+                    logger.info("Cancelling prior branching id=%s", branch_stream_id)
+                    await cancel_stream(branch_stream_task, "branching", branch_stream_id)
 
-                branch_stream_id = str(uuid.uuid4())
+                branch_stream_id = token_hex(8)
                 branch_stream_task = asyncio.create_task(
-                    run_branching_stream(query, model, previous_context, selected_agents, industry, api_key)
+                    run_branching_stream(query, model, previous_context, selected_agents, industry, api_key, compact, batch)
                 )
 
-            elif message.get("type") == "inject_constraint":
+            elif message.type == "inject_constraint":
                 # PRD Feature: Interrupt & Inject constraint mid-debate
-                constraint = message.get("constraint", "").strip()
+                constraint = message.constraint
                 if constraint:
-                    print(f"[{datetime.now().isoformat()}] Constraint injected: {constraint}")
+                    logger.info("Constraint injected: %s", constraint)
                     # Store constraint in orchestrator's user_constraints list
                     orchestrator.inject_constraint(constraint)
                     # Acknowledge the constraint injection immediately
                     ack = {
                         "type": "constraint_acknowledged",
                         "constraint": constraint,
-                        "timestamp": int(datetime.now().timestamp() * 1000)
+                        "timestamp": time.time_ns() // 1_000_000
                     }
-                    print(f"[{datetime.now().isoformat()}] WS send: {ack}")
+                    logger.info("WS send: %s", ack)
                     await safe_send(ack)
                 else:
                     await safe_send(create_error("Constraint cannot be empty"))
 
-            else:
-                # Unknown message type
-                await safe_send(create_error(f"Unknown message type: {message.get('type')}"))
-
     except WebSocketDisconnect:
-        disconnection_time = datetime.now().isoformat()
-        print(f"[{disconnection_time}] WebSocket disconnected - Client: {client_id}")
+        logger.info("WebSocket disconnected - Client: %s", client_id)
         if stream_task and not stream_task.done():
             stream_task.cancel()
         if branch_stream_task and not branch_stream_task.done():
             branch_stream_task.cancel()
-    except json.JSONDecodeError as e:
-        error_time = datetime.now().isoformat()
-        print(f"[{error_time}] JSON decode error: {e}")
-        await safe_send(create_error("Invalid JSON message"))
     except Exception as e:
-        error_time = datetime.now().isoformat()
-        print(f"[{error_time}] WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         await safe_send(create_error(f"Server error: {str(e)}"))
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        reload=True,
+    )
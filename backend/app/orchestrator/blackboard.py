@@ -5,9 +5,15 @@ Manages shared context between agents, allowing them to see and respond
 to each other's contributions during the debate.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional
-from datetime import datetime
+import heapq
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+# Punctuation followed by a space or newline ends a thought
+_THOUGHT_BOUNDARY = re.compile(r"[.?!][ \n]")
 
 
 @dataclass
@@ -17,6 +23,13 @@ class BlackboardEntry:
     content: str
     timestamp: float
     is_user_constraint: bool = False
+    # Whitespace-separated words in content, counted once when appended
+    word_count: int = field(default=0, compare=False)
+    # to_prompt_string() output, formatted once at construction
+    prompt_line: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.prompt_line = self.to_prompt_string()
 
     def to_prompt_string(self) -> str:
         """Format entry for inclusion in agent prompts."""
@@ -34,21 +47,39 @@ class Blackboard:
     """
 
     def __init__(self, max_tokens: int = 2000):
-        self.entries: List[BlackboardEntry] = []
+        # Agent entries can be evicted oldest-first; user constraints never are
+        self._agent_entries: Deque[BlackboardEntry] = deque()
+        self._user_entries: List[BlackboardEntry] = []
         self.max_tokens = max_tokens
         self.pending_tokens: dict[str, str] = {}  # agent_id -> accumulated text
+        self._scan_from: dict[str, int] = {}  # agent_id -> where add_token resumes its search
+        self._word_count = 0  # Running total of entry word counts
+        # get_context() results by excluded agent; cleared whenever entries change
+        self._context_cache: Dict[Optional[str], str] = {}
 
     def append(self, agent_id: str, content: str, is_user_constraint: bool = False):
         """Add a completed thought to the blackboard."""
+        content = content.strip()
         entry = BlackboardEntry(
             agent_id=agent_id,
-            content=content.strip(),
-            timestamp=datetime.now().timestamp(),
-            is_user_constraint=is_user_constraint
+            content=content,
+            timestamp=time.time(),
+            is_user_constraint=is_user_constraint,
+            word_count=len(content.split()),
         )
-        self.entries.append(entry)
+        if is_user_constraint:
+            self._user_entries.append(entry)
+        else:
+            self._agent_entries.append(entry)
+        self._word_count += entry.word_count
+        self._context_cache.clear()
         self._truncate_if_needed()
 
+    @property
+    def entries(self) -> List[BlackboardEntry]:
+        """All entries in timestamp order, user constraints included."""
+        return list(heapq.merge(self._agent_entries, self._user_entries, key=lambda e: e.timestamp))
+
     def add_token(self, agent_id: str, token: str):
         """
         Accumulate tokens and detect thought boundaries.
@@ -56,46 +87,45 @@ class Blackboard:
         Thought boundaries are: ., ?, ! followed by space or newline.
         When a boundary is detected, the completed thought is added to the blackboard.
         """
-        if agent_id not in self.pending_tokens:
-            self.pending_tokens[agent_id] = ""
-
-        self.pending_tokens[agent_id] += token
-
-        # Check for thought boundary (longer boundaries first to avoid partial matches)
-        text = self.pending_tokens[agent_id]
-        # Boundaries: punctuation followed by space/newline, or at end of string
-        boundaries = ['. ', '? ', '! ', '.\n', '?\n', '!\n']
-
-        for boundary in boundaries:
-            if boundary in text:
-                parts = text.split(boundary, 1)
-                thought = parts[0] + boundary.strip()
-                remainder = parts[1] if len(parts) > 1 else ""
-
-                # Append completed thought (avoid tiny fragments)
-                if len(thought.strip()) > 10:
-                    self.append(agent_id, thought)
-                else:
-                    # Keep tiny fragments in remainder
-                    remainder = thought + (remainder if remainder else "")
-
+        text = self.pending_tokens.get(agent_id, "") + token
+        self.pending_tokens[agent_id] = text
+
+        # Text before the scan position has already been searched
+        match = _THOUGHT_BOUNDARY.search(text, self._scan_from.get(agent_id, 0))
+        if match:
+            end = match.start() + 1  # Keep the punctuation, drop the space/newline
+            thought = text[:end]
+            remainder = text[match.end():]
+
+            # Append completed thought (avoid tiny fragments)
+            if len(thought.strip()) > 10:
+                self.append(agent_id, thought)
                 self.pending_tokens[agent_id] = remainder
-                break
+                self._scan_from[agent_id] = 0
+            else:
+                # Keep tiny fragments in remainder
+                self.pending_tokens[agent_id] = thought + remainder
+                self._scan_from[agent_id] = end
+            return
+
+        # No boundary with space/newline found; check for terminal punctuation at end
+        thought = text.rstrip()
+        if thought.endswith(('.', '?', '!')) and len(thought) > 10:
+            # Only process if it's a complete thought (ends with punctuation)
+            # and is long enough to be meaningful
+            self.append(agent_id, thought)
+            self.pending_tokens[agent_id] = ""
+            self._scan_from[agent_id] = 0
         else:
-            # No boundary with space/newline found; check for terminal punctuation at end
-            if text.rstrip().endswith(('.', '?', '!')):
-                # Only process if it's a complete thought (ends with punctuation)
-                # and is long enough to be meaningful
-                thought = text.rstrip()
-                if len(thought) > 10:
-                    self.append(agent_id, thought)
-                    self.pending_tokens[agent_id] = ""
+            # Rescan the last character: it may be punctuation whose space comes next
+            self._scan_from[agent_id] = max(len(text) - 1, 0)
 
     def flush_pending(self, agent_id: str):
         """Flush any remaining pending tokens for an agent."""
         if agent_id in self.pending_tokens and self.pending_tokens[agent_id].strip():
             self.append(agent_id, self.pending_tokens[agent_id])
             self.pending_tokens[agent_id] = ""
+            self._scan_from[agent_id] = 0
 
     def get_context(self, exclude_agent: Optional[str] = None) -> str:
         """
@@ -107,16 +137,19 @@ class Blackboard:
         Returns:
             Formatted context string or empty string if no entries
         """
-        if not self.entries:
+        exclude_agent = exclude_agent or None
+        cached = self._context_cache.get(exclude_agent)
+        if cached is not None:
+            return cached
+
+        entries = self.entries
+        if not entries:
             return ""
 
         lines = ["Previous debate contributions:"]
-        for entry in self.entries:
-            if exclude_agent and entry.agent_id == exclude_agent:
-                continue
-            lines.append(entry.to_prompt_string())
-
-        return "\n".join(lines)
+        lines.extend(entry.prompt_line for entry in entries if entry.agent_id != exclude_agent)
+        context = self._context_cache[exclude_agent] = "\n".join(lines)
+        return context
 
     def get_entries_for_agent(self, agent_id: str) -> List[BlackboardEntry]:
         """Get all entries from a specific agent."""
@@ -124,43 +157,39 @@ class Blackboard:
 
     def get_user_constraints(self) -> List[BlackboardEntry]:
         """Get all user constraint entries."""
-        return [e for e in self.entries if e.is_user_constraint]
+        return list(self._user_entries)
 
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count (rough: words * 1.3)."""
-        return int(len(text.split()) * 1.3 + 0.5)  # Round to nearest int
+        return self._words_to_tokens(len(text.split()))
+
+    @staticmethod
+    def _words_to_tokens(words: int) -> int:
+        return int(words * 1.3 + 0.5)  # Round to nearest int
 
     def _truncate_if_needed(self):
-        """Remove oldest entries if over token limit. User constraints are never truncated."""
-        # Separate user constraints from agent entries
-        user_entries = [e for e in self.entries if e.is_user_constraint]
-        agent_entries = [e for e in self.entries if not e.is_user_constraint]
-
-        total_text = " ".join(e.content for e in self.entries)
-        current_tokens = self._estimate_tokens(total_text)
-
-        # Remove oldest agent entries until under limit
-        while current_tokens > self.max_tokens and agent_entries:
-            agent_entries.pop(0)
-            total_text = " ".join(e.content for e in agent_entries + user_entries)
-            current_tokens = self._estimate_tokens(total_text)
-
-        # Recombine and sort by timestamp
-        self.entries = sorted(
-            agent_entries + user_entries,
-            key=lambda e: e.timestamp
-        )
+        """
+        Remove oldest entries if over token limit. User constraints are never truncated.
+
+        Works from the running word count, so each append costs only the
+        entries it evicts rather than a re-count of the whole blackboard.
+        """
+        while self._words_to_tokens(self._word_count) > self.max_tokens and self._agent_entries:
+            self._word_count -= self._agent_entries.popleft().word_count
 
     def clear(self):
         """Clear the blackboard for a new debate."""
-        self.entries = []
+        self._agent_entries.clear()
+        self._user_entries.clear()
         self.pending_tokens = {}
+        self._scan_from = {}
+        self._word_count = 0
+        self._context_cache.clear()
 
     def get_token_count(self) -> int:
         """Get estimated token count of all entries."""
-        total_text = " ".join(e.content for e in self.entries)
-        return self._estimate_tokens(total_text)
+        return self._words_to_tokens(self._word_count)
 
     def __len__(self) -> int:
         """Return number of entries."""
-        return len(self.entries)
+        return len(self._agent_entries) + len(self._user_entries)
@@ -13,13 +13,16 @@ Supports custom agent selection and follow-up questions with context.
 """
 
 import asyncio
+import logging
 import time
 from typing import AsyncGenerator, Dict, Any, List, Optional
-from datetime import datetime
 from dataclasses import dataclass
 
 from app.agents import AGENT_REGISTRY
 from app.agents.industry import get_industry_agent_registry, get_industry_agent_ids, INDUSTRY_AGENTS
+from app.config import settings
+
+logger = logging.getLogger("mindglass.debate")
 
 # All available agent IDs
 ALL_AGENT_IDS = ['analyst', 'optimist', 'pessimist', 'critic', 'strategist', 'finance', 'risk', 'synthesizer']
@@ -88,6 +91,15 @@ class RoundRestartRequested(Exception):
     """Raised when a constraint is injected mid-round and we need to restart the round."""
 
 
+async def _cancel_and_wait(tasks: List[asyncio.Task]) -> None:
+    """Cancel the tasks still running and wait until they have unwound."""
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+
 class DebateOrchestrator:
     """
     Orchestrates a multi-round debate where agents actually respond to each other.
@@ -154,15 +166,15 @@ class DebateOrchestrator:
             agent_id: AgentClass(api_key=api_key_override)
             for agent_id, AgentClass in registry.items()
         }
-        print(f"[{datetime.now().isoformat()}] Initialized agents for industry '{industry or 'any'}': {list(self.agents.keys())}")
+        logger.info("Initialized agents for industry '%s': %s", industry or 'any', list(self.agents))
 
     def inject_constraint(self, constraint: str):
         """Inject a user constraint that all subsequent agents will see."""
         self.user_constraints.append(constraint)
-        print(f"[{datetime.now().isoformat()}] Constraint injected! Total constraints: {len(self.user_constraints)}")
+        logger.info("Constraint injected! Total constraints: %d", len(self.user_constraints))
         # If a round is currently streaming, request a restart so all agents see the new constraint
         if self._interrupt_event is not None and self._current_round_num is not None:
-            print(f"[{datetime.now().isoformat()}] Restart requested for round {self._current_round_num}")
+            logger.info("Restart requested for round %s", self._current_round_num)
             self._interrupt_event.set()
 
     async def stream_debate(
@@ -236,13 +248,13 @@ class DebateOrchestrator:
         # Disable reasoning for GPT-OSS (no <think> tags)
         use_reasoning = False
         
-        print(f"[{datetime.now().isoformat()}] Debate starting - model: {model_id}, tier: {model}")
-        print(f"[{datetime.now().isoformat()}] Selected agents: {self.selected_agents}")
-        print(f"[{datetime.now().isoformat()}] Query: {query[:100]}...")
+        logger.info("Debate starting - model: %s, tier: %s", model_id, model)
+        logger.info("Selected agents: %s", self.selected_agents)
+        logger.info("Query: %.100s...", query)
         if self.industry:
-            print(f"[{datetime.now().isoformat()}] Industry context: {self.industry}")
+            logger.info("Industry context: %s", self.industry)
         if self.previous_context:
-            print(f"[{datetime.now().isoformat()}] Has previous context: {len(self.previous_context)} chars")
+            logger.info("Has previous context: %d chars", len(self.previous_context))
 
         # Build customized debate rounds based on selected agents
         debate_rounds = self._build_debate_rounds()
@@ -260,7 +272,7 @@ class DebateOrchestrator:
                 "round": round_config.round_num,
                 "name": round_config.name,
                 "agents": round_config.agents,
-                "timestamp": int(datetime.now().timestamp() * 1000)
+                "timestamp": time.time_ns() // 1_000_000
             }
             yield round_start_msg
             
@@ -269,11 +281,11 @@ class DebateOrchestrator:
                 "type": "phase_start", 
                 "phase": round_config.round_num, 
                 "name": round_config.name,
-                "timestamp": int(datetime.now().timestamp() * 1000)
+                "timestamp": time.time_ns() // 1_000_000
             }
             yield phase_start_msg
             
-            print(f"[{datetime.now().isoformat()}] Round {round_config.round_num}: {round_config.name} - Agents: {round_config.agents}")
+            logger.info("Round %d: %s - Agents: %s", round_config.round_num, round_config.name, round_config.agents)
             
             # Build the debate context for this round
             debate_context = self._build_debate_context(round_config)
@@ -281,12 +293,11 @@ class DebateOrchestrator:
             # Create the enriched prompt with full context
             enriched_query = self._create_round_prompt(query, round_config, debate_context)
             
-            # Log constraint status
-            constraint_info = f", constraints={len(self.user_constraints)}" if self.user_constraints else ""
-            print(
-                f"[{datetime.now().isoformat()}] Round {round_config.round_num} prompt stats - "
-                f"query_chars={len(query)}, context_chars={len(debate_context)}, enriched_chars={len(enriched_query)}, "
-                f"model_id={model_id}{constraint_info}"
+            logger.info(
+                "Round %d prompt stats - query_chars=%d, context_chars=%d, enriched_chars=%d, "
+                "model_id=%s, constraints=%d",
+                round_config.round_num, len(query), len(debate_context), len(enriched_query),
+                model_id, len(self.user_constraints),
             )
             
             # Run agents for this round
@@ -301,8 +312,8 @@ class DebateOrchestrator:
                     yield msg
             except RoundRestartRequested:
                 # Clear any partial outputs for this round and retry
-                print(f"[{datetime.now().isoformat()}] Restarting round {round_config.round_num} due to constraint")
-                print(f"[{datetime.now().isoformat()}] Constraints now: {self.user_constraints}")
+                logger.info("Restarting round %d due to constraint", round_config.round_num)
+                logger.info("Constraints now: %s", self.user_constraints)
                 self.blackboard[round_config.round_num] = {}
                 continue
 
@@ -312,7 +323,7 @@ class DebateOrchestrator:
         elapsed = time.time() - self.start_time
         tps = self.token_count / elapsed if elapsed > 0 else 0
         
-        print(f"[{datetime.now().isoformat()}] Debate complete - {self.token_count} tokens in {elapsed:.1f}s ({tps:.0f} t/s)")
+        logger.info("Debate complete - %d tokens in %.1fs (%.0f t/s)", self.token_count, elapsed, tps)
         
         self._current_round_num = None
         debate_complete_msg = {
@@ -326,7 +337,7 @@ class DebateOrchestrator:
                 "rounds": self._bench_rounds,
                 "agents": self._bench_agents,
             },
-            "timestamp": int(datetime.now().timestamp() * 1000)
+            "timestamp": time.time_ns() // 1_000_000
         }
         yield debate_complete_msg
 
@@ -344,7 +355,7 @@ class DebateOrchestrator:
         Each branch reuses the standard debate flow but receives a scenario-specific prefix.
         """
         scenario_results: Dict[str, str] = {}
-        queue: asyncio.Queue = asyncio.Queue()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.STREAM_QUEUE_SIZE)
         running_tasks: list[asyncio.Task] = []
 
         async def stream_branch(branch_id: str, scenario_prefix: str):
@@ -369,32 +380,39 @@ class DebateOrchestrator:
                             synth_buffer.append(content)
                     await queue.put(msg)
             except Exception as exc:
-                await queue.put({
-                    "type": "error",
-                    "message": f"Scenario branch '{branch_id}' failed: {exc}",
-                    "branchId": branch_id,
-                    "timestamp": int(datetime.now().timestamp() * 1000),
-                })
+                if not asyncio.current_task().cancelling():
+                    await queue.put({
+                        "type": "error",
+                        "message": f"Scenario branch '{branch_id}' failed: {exc}",
+                        "branchId": branch_id,
+                        "timestamp": time.time_ns() // 1_000_000,
+                    })
             finally:
                 scenario_results[branch_id] = "".join(synth_buffer).strip()
-                await queue.put({
-                    "type": "__branch_done__",
-                    "branchId": branch_id,
-                })
+                # A cancelled branch has no consumer left to take the sentinel,
+                # and on a full queue the put would never return
+                if not asyncio.current_task().cancelling():
+                    await queue.put({
+                        "type": "__branch_done__",
+                        "branchId": branch_id,
+                    })
 
         for branch_id, prefix in SCENARIO_PREFIXES.items():
             running_tasks.append(asyncio.create_task(stream_branch(branch_id, prefix)))
 
-        completed_branches: set[str] = set()
-        while len(completed_branches) < len(SCENARIO_PREFIXES):
-            msg = await queue.get()
-            if msg.get("type") == "__branch_done__":
-                completed_branches.add(msg.get("branchId"))
-                continue
-            yield msg
+        try:
+            completed_branches: set[str] = set()
+            while len(completed_branches) < len(SCENARIO_PREFIXES):
+                msg = await queue.get()
+                if msg.get("type") == "__branch_done__":
+                    completed_branches.add(msg.get("branchId"))
+                    continue
+                yield msg
 
-        if running_tasks:
-            await asyncio.gather(*running_tasks, return_exceptions=True)
+            if running_tasks:
+                await asyncio.gather(*running_tasks, return_exceptions=True)
+        finally:
+            await _cancel_and_wait(running_tasks)
 
         meta_prompt = "\n".join([
             "You are the Meta-Synthesizer. You have three scenario summaries.",
@@ -551,9 +569,8 @@ class DebateOrchestrator:
             for i, constraint in enumerate(self.user_constraints, 1):
                 context_parts.append(f"{i}. {constraint}")
             context_parts.append("")
-            print(
-                f"[{datetime.now().isoformat()}] Context includes {len(self.user_constraints)} "
-                f"constraint(s): {self.user_constraints}"
+            logger.debug(
+                "Context includes %d constraint(s): %s", len(self.user_constraints), self.user_constraints
             )
             
         return "\n".join(context_parts)
@@ -642,7 +659,8 @@ class DebateOrchestrator:
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """Run all agents for a round in parallel, streaming their responses."""
         round_wall_start = time.time()
-        queue: asyncio.Queue = asyncio.Queue()
+        # Bounded so agents that outpace the client wait instead of buffering
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.STREAM_QUEUE_SIZE)
         running_tasks: list[asyncio.Task] = []
         agent_buffers: Dict[str, List[str]] = {aid: [] for aid in round_config.agents}
         agent_token_counts: Dict[str, int] = {aid: 0 for aid in round_config.agents}
@@ -658,6 +676,22 @@ class DebateOrchestrator:
         # Initialize blackboard for this round
         self.blackboard[round_config.round_num] = {}
 
+        # Agents whose agent_done is already queued; each must send exactly
+        # one, or the round would count itself finished early
+        done_queued: set[str] = set()
+
+        async def report_failure(agent_id: str, error: str):
+            """Queue an agent's error, then the agent_done that closes it out."""
+            if asyncio.current_task().cancelling():
+                # The round is being torn down: nobody will read these, and a
+                # put on a full queue would block its cleanup forever
+                return
+            now = time.time_ns() // 1_000_000
+            await queue.put({"type": "agent_error", "agentId": agent_id, "error": error, "timestamp": now})
+            if agent_id not in done_queued:
+                done_queued.add(agent_id)
+                await queue.put({"type": "agent_done", "agentId": agent_id, "timestamp": now})
+
         async def stream_agent(agent_id: str, agent, model_to_use: str):
             """Stream tokens from a single agent into the queue."""
             try:
@@ -677,48 +711,28 @@ class DebateOrchestrator:
                             if not sent_any and token["content"].startswith("[Error:"):
                                 return token["content"]
                             sent_any = True
+                        elif token.get("type") == "agent_done":
+                            done_queued.add(agent_id)
                         await queue.put(token)
                     return None
 
-                print(
-                    f"[{datetime.now().isoformat()}] Agent start: {agent_id} "
-                    f"(round {round_config.round_num}, model={model_to_use})"
+                logger.info(
+                    "Agent start: %s (round %d, model=%s)", agent_id, round_config.round_num, model_to_use
                 )
                 error_text = await run_with_model(model_to_use)
                 if error_text and fallback_model_id and model_to_use != fallback_model_id and self._is_retryable_error(error_text):
                     agent_model_used[agent_id] = fallback_model_id
-                    print(
-                        f"[{datetime.now().isoformat()}] Agent retry: {agent_id} "
-                        f"model={model_to_use} -> {fallback_model_id}"
+                    logger.warning(
+                        "Agent retry: %s model=%s -> %s", agent_id, model_to_use, fallback_model_id
                     )
                     error_text = await run_with_model(fallback_model_id)
 
                 if error_text:
                     error_msg = error_text.replace("[Error:", "").replace("]", "").strip()
-                    await queue.put({
-                        "type": "agent_error",
-                        "agentId": agent_id,
-                        "error": error_msg or "Unknown error",
-                        "timestamp": int(datetime.now().timestamp() * 1000)
-                    })
-                    await queue.put({
-                        "type": "agent_done",
-                        "agentId": agent_id,
-                        "timestamp": int(datetime.now().timestamp() * 1000)
-                    })
+                    await report_failure(agent_id, error_msg or "Unknown error")
             except Exception as e:
-                print(f"[{datetime.now().isoformat()}] Agent error {agent_id}: {e}")
-                await queue.put({
-                    "type": "agent_error",
-                    "agentId": agent_id,
-                    "error": str(e),
-                    "timestamp": int(datetime.now().timestamp() * 1000)
-                })
-                await queue.put({
-                    "type": "agent_done",
-                    "agentId": agent_id,
-                    "timestamp": int(datetime.now().timestamp() * 1000)
-                })
+                logger.error("Agent error %s: %s", agent_id, e)
+                await report_failure(agent_id, str(e))
 
         # Start all agents for this round
         for agent_id in round_config.agents:
@@ -730,125 +744,19 @@ class DebateOrchestrator:
         agents_done = 0
         total_agents = len(round_config.agents)
         last_metrics_time = time.time()
-
-        while agents_done < total_agents:
-            if self._interrupt_event is not None and self._interrupt_event.is_set():
-                self._interrupt_event.clear()
-                print(f"[{datetime.now().isoformat()}] Round {round_config.round_num} interrupted; cancelling tasks")
-                for task in running_tasks:
-                    task.cancel()
-                if running_tasks:
-                    await asyncio.wait(running_tasks, timeout=1)
-                while not queue.empty():
-                    queue.get_nowait()
-                raise RoundRestartRequested()
-            try:
-                token = await asyncio.wait_for(queue.get(), timeout=0.1)
-
-                if token["type"] == "agent_done":
-                    agents_done += 1
-                    agent_id = token.get("agentId")
-                    if agent_id:
-                        completed_agents.add(agent_id)
-                    # Save to blackboard for next round
-                    if agent_id in agent_buffers:
-                        self.blackboard[round_config.round_num][agent_id] = "".join(agent_buffers[agent_id])
-                        # Record per-agent benchmark
-                        started = agent_start_times.get(agent_id)
-                        first = agent_first_token_times.get(agent_id)
-                        gaps = agent_itl_samples.get(agent_id, [])
-
-                        def percentile(values: List[float], pct: float) -> Optional[float]:
-                            if not values:
-                                return None
-                            xs = sorted(values)
-                            idx = int(round((len(xs) - 1) * pct))
-                            return xs[max(0, min(idx, len(xs) - 1))]
-
-                        ttft_ms = int(round((first - started) * 1000)) if started and first else None
-                        avg_itl_ms = int(round((sum(gaps) / len(gaps)) * 1000)) if gaps else None
-                        p50_itl_ms = int(round(percentile(gaps, 0.50) * 1000)) if gaps else None
-                        p95_itl_ms = int(round(percentile(gaps, 0.95) * 1000)) if gaps else None
-
-                        api = agent_api_metrics.get(agent_id, {})
-                        self._bench_agents[agent_id] = {
-                            "round": round_config.round_num,
-                            "model": agent_model_used.get(agent_id, model_id),
-                            "ttftMs": ttft_ms,
-                            "avgItlMs": avg_itl_ms,
-                            "p50ItlMs": p50_itl_ms,
-                            "p95ItlMs": p95_itl_ms,
-                            "chunks": agent_token_counts.get(agent_id, 0),
-                            "promptTokens": api.get("promptTokens"),
-                            "completionTokens": api.get("completionTokens"),
-                            "totalTokens": api.get("totalTokens"),
-                            "completionTimeSec": api.get("completionTime"),
-                            "tokensPerSecond": api.get("tokensPerSecond"),
-                        }
-                    elapsed = None
-                    if agent_id in agent_start_times:
-                        elapsed = time.time() - agent_start_times[agent_id]
-                    tps = 0
-                    if elapsed and elapsed > 0:
-                        tps = agent_token_counts.get(agent_id, 0) / elapsed
-                    print(
-                        f"[{datetime.now().isoformat()}] Agent done: {agent_id} "
-                        f"(Round {round_config.round_num}: {agents_done}/{total_agents}) "
-                        f"tokens={agent_token_counts.get(agent_id, 0)} elapsed={elapsed:.2f}s tps={tps:.1f}"
-                    )
-                    yield token
-                elif token["type"] == "agent_error":
-                    yield token
-                elif token["type"] == "agent_metrics":
-                    # Keep API-provided usage + timing for benchmark report
-                    agent_id = token.get("agentId")
-                    if agent_id:
-                        agent_api_metrics[agent_id] = {
-                            "promptTokens": token.get("promptTokens"),
-                            "completionTokens": token.get("completionTokens"),
-                            "totalTokens": token.get("totalTokens"),
-                            "completionTime": token.get("completionTime"),
-                            "tokensPerSecond": token.get("tokensPerSecond"),
-                        }
-                    yield token
-                else:
-                    if token["type"] == "agent_token":
-                        agent_id = token.get("agentId")
-                        content = token.get("content")
-                        if agent_id and isinstance(content, str) and not content.startswith("[Error:"):
-                            now = time.time()
-                            if agent_id not in agent_first_token_times:
-                                agent_first_token_times[agent_id] = now
-                                if self._bench_first_token_at is None:
-                                    self._bench_first_token_at = now
-                            else:
-                                last = agent_last_token_times.get(agent_id)
-                                if last is not None:
-                                    agent_itl_samples.setdefault(agent_id, []).append(now - last)
-                            agent_last_token_times[agent_id] = now
-
-                            agent_buffers[agent_id].append(content)
-                            agent_token_counts[agent_id] += 1
-                        self.token_count += 1
-                    yield token
-
-                # Send metrics every 500ms
-                current_time = time.time()
-                if current_time - last_metrics_time >= 0.5:
-                    elapsed = current_time - self.start_time
-                    tps = self.token_count / elapsed if elapsed > 0 else 0
-                    yield {
-                        "type": "metrics",
-                        "tokensPerSecond": round(tps),
-                        "totalTokens": self.token_count,
-                        "timestamp": int(datetime.now().timestamp() * 1000)
-                    }
-                    last_metrics_time = current_time
-
-            except asyncio.TimeoutError:
+        # The loop sleeps until a token arrives, a constraint interrupts the
+        # round, or the next stall status log is due
+        getter: Optional[asyncio.Future] = None
+        interrupted = (
+            asyncio.ensure_future(self._interrupt_event.wait())
+            if self._interrupt_event is not None else None
+        )
+
+        try:
+            while agents_done < total_agents:
                 if self._interrupt_event is not None and self._interrupt_event.is_set():
                     self._interrupt_event.clear()
-                    print(f"[{datetime.now().isoformat()}] Round {round_config.round_num} interrupted during wait; cancelling tasks")
+                    logger.info("Round %d interrupted; cancelling tasks", round_config.round_num)
                     for task in running_tasks:
                         task.cancel()
                     if running_tasks:
@@ -856,30 +764,169 @@ class DebateOrchestrator:
                     while not queue.empty():
                         queue.get_nowait()
                     raise RoundRestartRequested()
-                now = time.time()
-                if now - last_status_log >= 5:
-                    pending_agents = [aid for aid in round_config.agents if aid not in completed_agents]
-                    pending_status = []
-                    for aid in pending_agents:
-                        started = agent_start_times.get(aid)
-                        last_token = agent_last_token_times.get(aid)
-                        if started is None:
-                            status = "not-started"
-                        elif last_token is None:
-                            status = f"started {now - started:.1f}s ago, no tokens"
-                        else:
-                            status = f"last token {now - last_token:.1f}s ago"
-                        pending_status.append(f"{aid}: {status}")
-                    print(
-                        f"[{datetime.now().isoformat()}] Round {round_config.round_num} status - "
-                        f"pending={pending_agents} | {', '.join(pending_status)} | queue={queue.qsize()}"
-                    )
-                    last_status_log = now
-                continue
-
-        # Wait for all tasks
-        if running_tasks:
-            await asyncio.gather(*running_tasks, return_exceptions=True)
+                try:
+                    # Tokens already queued are taken directly; a getter is
+                    # only parked on the queue once it has run dry
+                    if getter is None and not queue.empty():
+                        token = queue.get_nowait()
+                    else:
+                        if getter is None:
+                            getter = asyncio.ensure_future(queue.get())
+                        waiters = {getter} if interrupted is None else {getter, interrupted}
+                        await asyncio.wait(
+                            waiters,
+                            timeout=max(0.0, last_status_log + 5 - time.time()),
+                            return_when=asyncio.FIRST_COMPLETED,
+                        )
+                        if not getter.done():
+                            raise asyncio.TimeoutError
+                        token = getter.result()
+                        getter = None
+
+                    if token["type"] == "agent_done":
+                        agents_done += 1
+                        agent_id = token.get("agentId")
+                        if agent_id:
+                            completed_agents.add(agent_id)
+                        # Save to blackboard for next round
+                        if agent_id in agent_buffers:
+                            self.blackboard[round_config.round_num][agent_id] = "".join(agent_buffers[agent_id])
+                            # Record per-agent benchmark
+                            started = agent_start_times.get(agent_id)
+                            first = agent_first_token_times.get(agent_id)
+                            gaps = agent_itl_samples.get(agent_id, [])
+
+                            def percentile(values: List[float], pct: float) -> Optional[float]:
+                                if not values:
+                                    return None
+                                xs = sorted(values)
+                                idx = int(round((len(xs) - 1) * pct))
+                                return xs[max(0, min(idx, len(xs) - 1))]
+
+                            ttft_ms = int(round((first - started) * 1000)) if started and first else None
+                            avg_itl_ms = int(round((sum(gaps) / len(gaps)) * 1000)) if gaps else None
+                            p50_itl_ms = int(round(percentile(gaps, 0.50) * 1000)) if gaps else None
+                            p95_itl_ms = int(round(percentile(gaps, 0.95) * 1000)) if gaps else None
+
+                            api = agent_api_metrics.get(agent_id, {})
+                            self._bench_agents[agent_id] = {
+                                "round": round_config.round_num,
+                                "model": agent_model_used.get(agent_id, model_id),
+                                "ttftMs": ttft_ms,
+                                "avgItlMs": avg_itl_ms,
+                                "p50ItlMs": p50_itl_ms,
+                                "p95ItlMs": p95_itl_ms,
+                                "chunks": agent_token_counts.get(agent_id, 0),
+                                "promptTokens": api.get("promptTokens"),
+                                "cachedTokens": api.get("cachedTokens"),
+                                "completionTokens": api.get("completionTokens"),
+                                "totalTokens": api.get("totalTokens"),
+                                "completionTimeSec": api.get("completionTime"),
+                                "tokensPerSecond": api.get("tokensPerSecond"),
+                            }
+                        elapsed = None
+                        if agent_id in agent_start_times:
+                            elapsed = time.time() - agent_start_times[agent_id]
+                        tps = 0
+                        if elapsed and elapsed > 0:
+                            tps = agent_token_counts.get(agent_id, 0) / elapsed
+                        logger.info(
+                            "Agent done: %s (Round %d: %d/%d) tokens=%d elapsed=%.2fs tps=%.1f",
+                            agent_id, round_config.round_num, agents_done, total_agents,
+                            agent_token_counts.get(agent_id, 0), elapsed or 0.0, tps,
+                        )
+                        yield token
+                    elif token["type"] == "agent_error":
+                        yield token
+                    elif token["type"] == "agent_metrics":
+                        # Keep API-provided usage + timing for benchmark report
+                        agent_id = token.get("agentId")
+                        if agent_id:
+                            agent_api_metrics[agent_id] = {
+                                "promptTokens": token.get("promptTokens"),
+                                "cachedTokens": token.get("cachedTokens"),
+                                "completionTokens": token.get("completionTokens"),
+                                "totalTokens": token.get("totalTokens"),
+                                "completionTime": token.get("completionTime"),
+                                "tokensPerSecond": token.get("tokensPerSecond"),
+                            }
+                        yield token
+                    else:
+                        if token["type"] == "agent_token":
+                            agent_id = token.get("agentId")
+                            content = token.get("content")
+                            if agent_id and isinstance(content, str) and not content.startswith("[Error:"):
+                                now = time.time()
+                                if agent_id not in agent_first_token_times:
+                                    agent_first_token_times[agent_id] = now
+                                    if self._bench_first_token_at is None:
+                                        self._bench_first_token_at = now
+                                else:
+                                    last = agent_last_token_times.get(agent_id)
+                                    if last is not None:
+                                        agent_itl_samples.setdefault(agent_id, []).append(now - last)
+                                agent_last_token_times[agent_id] = now
+
+                                agent_buffers[agent_id].append(content)
+                                agent_token_counts[agent_id] += 1
+                            self.token_count += 1
+                        yield token
+
+                    # Send metrics every 500ms
+                    current_time = time.time()
+                    if current_time - last_metrics_time >= 0.5:
+                        elapsed = current_time - self.start_time
+                        tps = self.token_count / elapsed if elapsed > 0 else 0
+                        yield {
+                            "type": "metrics",
+                            "tokensPerSecond": round(tps),
+                            "totalTokens": self.token_count,
+                            "timestamp": time.time_ns() // 1_000_000
+                        }
+                        last_metrics_time = current_time
+
+                except asyncio.TimeoutError:
+                    if self._interrupt_event is not None and self._interrupt_event.is_set():
+                        self._interrupt_event.clear()
+                        logger.info("Round %d interrupted during wait; cancelling tasks", round_config.round_num)
+                        for task in running_tasks:
+                            task.cancel()
+                        if running_tasks:
+                            await asyncio.wait(running_tasks, timeout=1)
+                        while not queue.empty():
+                            queue.get_nowait()
+                        raise RoundRestartRequested()
+                    now = time.time()
+                    if now - last_status_log >= 5:
+                        pending_agents = [aid for aid in round_config.agents if aid not in completed_agents]
+                        pending_status = []
+                        for aid in pending_agents:
+                            started = agent_start_times.get(aid)
+                            last_token = agent_last_token_times.get(aid)
+                            if started is None:
+                                status = "not-started"
+                            elif last_token is None:
+                                status = f"started {now - started:.1f}s ago, no tokens"
+                            else:
+                                status = f"last token {now - last_token:.1f}s ago"
+                            pending_status.append(f"{aid}: {status}")
+                        logger.info(
+                            "Round %d status - pending=%s | %s | queue=%d",
+                            round_config.round_num, pending_agents, ", ".join(pending_status), queue.qsize(),
+                        )
+                        last_status_log = now
+                    continue
+
+            # Wait for all tasks
+            if running_tasks:
+                await asyncio.gather(*running_tasks, return_exceptions=True)
+        finally:
+            for waiter in (getter, interrupted):
+                if waiter is not None:
+                    waiter.cancel()
+            # If the consumer stopped early (debate cancelled, client gone),
+            # stop agents that are still streaming so they stop paying for tokens
+            await _cancel_and_wait(running_tasks)
 
         # Record round benchmark
         duration_ms = int(round((time.time() - round_wall_start) * 1000))
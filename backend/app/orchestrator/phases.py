@@ -5,10 +5,10 @@ Defines the 4-phase debate state machine with timing and agent assignments.
 Total debate duration: 12 seconds maximum (per PRD NFR9)
 """
 
+import time
 from enum import Enum, auto
 from dataclasses import dataclass
 from typing import List, Optional
-from datetime import datetime
 
 
 class Phase(Enum):
@@ -122,7 +122,7 @@ def create_phase_change_message(phase: Phase, active_agents: List[str]) -> dict:
         "type": "phase_change",
         "phase": phase.value,
         "activeAgents": active_agents,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
@@ -0,0 +1,174 @@
+"""
+Token frame batching for MindGlass WebSocket streams
+Groups agent_token messages that arrive close together into one frame
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.websocket.messages import compact_token, create_token_batch
+
+Message = Dict[str, Any]
+
+# Marks the end of the source stream in the forwarding queue
+_END = object()
+
+logger = logging.getLogger("mindglass.ws")
+
+
+async def forward_messages(
+    messages: AsyncGenerator[Message, None],
+    send: Callable[[Message], Awaitable[None]],
+    compact: bool = False,
+    batch: bool = False,
+) -> None:
+    """
+    Send every message from a debate stream to the client.
+
+    A pump task reads the stream into a bounded queue, so a slow client
+    only stalls the agents once STREAM_QUEUE_SIZE messages are waiting.
+    When the client falls behind, queued tokens from the same agent are
+    merged into one agent_token frame.
+
+    With batch set, agent_token messages are collected for up to
+    WS_BATCH_LINGER_MS (or WS_BATCH_MAX_TOKENS messages) and sent as one
+    agent_tokens_batch frame. Any other message first flushes the pending
+    tokens, so the client sees messages in the order they were produced.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.STREAM_QUEUE_SIZE)
+    pump_task = asyncio.create_task(_pump(messages, queue))
+    try:
+        if batch:
+            await _forward_batched(
+                queue,
+                send,
+                compact,
+                max_items=settings.WS_BATCH_MAX_TOKENS,
+                linger=settings.WS_BATCH_LINGER_MS / 1000,
+            )
+        else:
+            await _forward_merged(queue, send, compact)
+    finally:
+        # Stops the debate stream when the client goes away or a new run starts,
+        # and waits for it to close so its cleanup finishes before we return
+        pump_task.cancel()
+        await asyncio.wait({pump_task})
+
+
+async def _pump(messages: AsyncGenerator[Message, None], queue: asyncio.Queue) -> None:
+    # Runs as its own task so the consumer's timeouts never cancel the
+    # stream's generator mid-step
+    try:
+        async for message in messages:
+            await queue.put(message)
+    except Exception as exc:
+        await queue.put(exc)
+    else:
+        await queue.put(_END)
+    finally:
+        # Cancelled while waiting on a full queue, the stream is still open
+        await messages.aclose()
+
+
+def _merge_backlog(token: Message, queue: asyncio.Queue) -> Tuple[Message, Any]:
+    """
+    Fold queued agent_token messages that directly follow token and come
+    from the same agent and branch into it. Returns the merged message and
+    the first queued item that could not be merged, or None.
+    """
+    parts = [token["content"]]
+    held = None
+    while not queue.empty():
+        item = queue.get_nowait()
+        if (
+            not isinstance(item, dict)
+            or item.get("type") != "agent_token"
+            or item.get("agentId") != token.get("agentId")
+            or item.get("branchId") != token.get("branchId")
+        ):
+            held = item
+            break
+        parts.append(item["content"])
+    if len(parts) == 1:
+        return token, held
+    return {**token, "content": "".join(parts)}, held
+
+
+async def _forward_merged(
+    queue: asyncio.Queue,
+    send: Callable[[Message], Awaitable[None]],
+    compact: bool,
+) -> None:
+    held: Optional[Any] = None
+    while True:
+        if held is not None:
+            item, held = held, None
+        else:
+            item = await queue.get()
+
+        if item is _END:
+            return
+        if isinstance(item, Exception):
+            raise item
+
+        if item.get("type") == "agent_token":
+            if not queue.empty():
+                logger.debug("Send queue backlog: %d", queue.qsize())
+                item, held = _merge_backlog(item, queue)
+            if compact:
+                item = compact_token(item)
+        await send(item)
+
+
+async def _forward_batched(
+    queue: asyncio.Queue,
+    send: Callable[[Message], Awaitable[None]],
+    compact: bool,
+    max_items: int,
+    linger: float,
+) -> None:
+    loop = asyncio.get_running_loop()
+    pending: List[Message] = []
+    deadline = 0.0
+
+    async def flush() -> None:
+        if len(pending) == 1:
+            await send(pending[0])
+        elif pending:
+            await send(create_token_batch(pending))
+        pending.clear()
+
+    while True:
+        if pending:
+            timeout = deadline - loop.time()
+            try:
+                if timeout > 0:
+                    # asyncio.timeout, unlike wait_for on 3.11, never swallows a
+                    # cancel that lands as the get completes
+                    async with asyncio.timeout(timeout):
+                        item = await queue.get()
+                else:
+                    item = queue.get_nowait()
+            except (TimeoutError, asyncio.QueueEmpty):
+                await flush()
+                continue
+        else:
+            item = await queue.get()
+
+        if item is _END or isinstance(item, Exception):
+            await flush()
+            if item is _END:
+                return
+            raise item
+
+        if item.get("type") == "agent_token":
+            if not pending:
+                deadline = loop.time() + linger
+            pending.append(compact_token(item) if compact else item)
+            if len(pending) >= max_items:
+                await flush()
+        else:
+            await flush()
+            await send(item)
@@ -1,8 +1,10 @@
 import json
 import asyncio
-from typing import Dict, Set
+from typing import Dict, Iterable, Set
 from fastapi import WebSocket
 
+from app.websocket.messages import encode_message
+
 class WebSocketManager:
     """
     Manages WebSocket connections for real-time communication.
@@ -36,37 +38,52 @@ class WebSocketManager:
 
         try:
             websocket = self.active_connections[client_id]
-            await websocket.send_json(message)
+            await websocket.send_text(encode_message(message))
             return True
         except Exception as e:
             print(f"Error sending message to {client_id}: {e}")
             return False
 
-    async def broadcast(self, message: Dict, exclude: str = None) -> None:
-        """Broadcast a message to all connected clients."""
-        disconnected = []
-
-        for client_id, websocket in self.active_connections.items():
-            if client_id == exclude:
-                continue
+    async def _fan_out(self, client_ids: Iterable[str], message: Dict) -> None:
+        """
+        Send one message to several clients.
+
+        The message is encoded once and the same text is written to every
+        socket concurrently; clients whose send fails are disconnected.
+        """
+        targets = [
+            (client_id, self.active_connections[client_id])
+            for client_id in client_ids
+            if client_id in self.active_connections
+        ]
+        if not targets:
+            return
 
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                print(f"Error broadcasting to {client_id}: {e}")
-                disconnected.append(client_id)
+        text = encode_message(message)
+        results = await asyncio.gather(
+            *(websocket.send_text(text) for _, websocket in targets),
+            return_exceptions=True,
+        )
 
         # Clean up disconnected clients
-        for client_id in disconnected:
-            self.disconnect(client_id)
+        for (client_id, _), result in zip(targets, results):
+            if isinstance(result, Exception):
+                print(f"Error broadcasting to {client_id}: {result}")
+                self.disconnect(client_id)
+
+    async def broadcast(self, message: Dict, exclude: str = None) -> None:
+        """Broadcast a message to all connected clients."""
+        await self._fan_out(
+            [client_id for client_id in self.active_connections if client_id != exclude],
+            message,
+        )
 
     async def send_to_group(self, group_id: str, message: Dict) -> None:
         """Send a message to all clients in a specific group."""
         if group_id not in self.connection_groups:
             return
 
-        for client_id in self.connection_groups[group_id]:
-            await self.send_message(client_id, message)
+        await self._fan_out(list(self.connection_groups[group_id]), message)
 
     def add_to_group(self, client_id: str, group_id: str) -> None:
         """Add a client to a connection group."""
@@ -3,32 +3,78 @@ WebSocket Message Protocol for MindGlass
 Defines typed message structures for client-server communication
 """
 
-from typing import TypedDict, Optional, Literal, List
-from datetime import datetime
+import time
+from typing import Annotated, Any, Mapping, TypedDict, Optional, Literal, List, Union
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, SecretStr, TypeAdapter, ValidationError
 
 
 # Inbound messages (client → server)
+# Parsed and validated in one pass by parse_inbound_message. Strings are
+# stripped; unknown fields are ignored.
+
+class _InboundMessage(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+class _StartMessage(_InboundMessage):
+    query: str = ""
+    model: str = "pro"
+    previousContext: Optional[str] = ""  # Context from previous turns in the session
+    selectedAgents: Optional[List[str]] = None  # Which agents to include (defaults to all)
+    industry: Optional[str] = ""  # Industry context for tailored advice
+    apiKey: Optional[SecretStr] = None  # Optional user-provided Cerebras API key, masked in logs
+    compactTokens: bool = False  # Client accepts CompactTokenMessage frames
+    batchTokens: bool = False  # Client accepts AgentTokensBatchMessage frames
 
-class StartDebateMessage(TypedDict):
+    @property
+    def api_key(self) -> Optional[str]:
+        """The user-provided API key, or None when absent or blank"""
+        if self.apiKey is None:
+            return None
+        return self.apiKey.get_secret_value().strip() or None
+
+
+class StartDebateMessage(_StartMessage):
     """Message to start a debate with a query"""
     type: Literal["start_debate"]
-    query: str
-    model: Optional[str]
-    previousContext: Optional[str]  # Context from previous turns in the session
-    selectedAgents: Optional[List[str]]  # Which agents to include (defaults to all)
-    industry: Optional[str]  # Industry context for tailored advice
-    apiKey: Optional[str]  # Optional user-provided Cerebras API key
 
 
-class StartBranchingMessage(TypedDict):
+class StartBranchingMessage(_StartMessage):
     """Message to start branching scenarios with a base query"""
     type: Literal["start_branching"]
-    query: str
-    model: Optional[str]
-    previousContext: Optional[str]
-    selectedAgents: Optional[List[str]]
-    industry: Optional[str]
-    apiKey: Optional[str]
+
+
+class InjectConstraintMessage(_InboundMessage):
+    """Constraint injected by the user mid-debate"""
+    type: Literal["inject_constraint"]
+    constraint: str = ""
+
+
+InboundMessage = Annotated[
+    Union[StartDebateMessage, StartBranchingMessage, InjectConstraintMessage],
+    Field(discriminator="type"),
+]
+_inbound_adapter: TypeAdapter[InboundMessage] = TypeAdapter(InboundMessage)
+
+
+def parse_inbound_message(data: Union[str, bytes]) -> InboundMessage:
+    """Parse and validate a raw client frame; raises pydantic.ValidationError"""
+    return _inbound_adapter.validate_json(data)
+
+
+def describe_invalid_message(error: ValidationError) -> str:
+    """Turn a parse_inbound_message failure into the error text sent to the client"""
+    first = error.errors(include_url=False)[0]
+    if first["type"] == "json_invalid":
+        return "Invalid JSON message"
+    if first["type"] == "union_tag_invalid":
+        return f"Unknown message type: {first['ctx']['tag']}"
+    if first["type"] == "union_tag_not_found":
+        return "Unknown message type: None"
+    field = ".".join(str(part) for part in first["loc"][1:]) or "message"
+    return f"Invalid {field}: {first['msg']}"
 
 
 # Outbound messages (server → client)
@@ -42,6 +88,27 @@ class AgentTokenMessage(TypedDict):
     timestamp: int
 
 
+class CompactTokenMessage(TypedDict, total=False):
+    """
+    Short-key form of AgentTokenMessage, sent to clients that opt in with
+    compactTokens. Drops the timestamp; t is always "k".
+    """
+    t: Literal["k"]
+    a: str  # agentId
+    c: str  # content
+    b: str  # branchId, only present for branch streams
+
+
+class AgentTokensBatchMessage(TypedDict):
+    """
+    Several agent token messages sent as one frame, to clients that opt in
+    with batchTokens. Items keep their order and are full or compact token
+    messages depending on compactTokens.
+    """
+    type: Literal["agent_tokens_batch"]
+    items: List[Union[AgentTokenMessage, CompactTokenMessage]]
+
+
 class DebateCompleteMessage(TypedDict):
     """Signal that the debate is complete"""
     type: Literal["debate_complete"]
@@ -104,6 +171,8 @@ WebSocketMessage = (
     StartDebateMessage |
     StartBranchingMessage |
     AgentTokenMessage |
+    CompactTokenMessage |
+    AgentTokensBatchMessage |
     DebateCompleteMessage |
     ErrorMessage |
     ConnectionAckMessage |
@@ -114,21 +183,47 @@ WebSocketMessage = (
 )
 
 
+def encode_message(message: Mapping[str, Any]) -> str:
+    """
+    Serialize an outbound message to JSON text.
+
+    Uses orjson, which is several times faster than the stdlib encoder on
+    these small dicts. Non-string keys (the benchmark's round numbers) are
+    written as strings, as json.dumps would.
+    """
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def create_agent_token(agent_id: str, content: str) -> AgentTokenMessage:
     """Create an agent token message"""
     return {
         "type": "agent_token",
         "agentId": agent_id,
         "content": content,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
+def compact_token(message: AgentTokenMessage) -> CompactTokenMessage:
+    """Convert an agent token message to its compact wire form"""
+    compact: CompactTokenMessage = {"t": "k", "a": message["agentId"], "c": message["content"]}
+    if message.get("branchId"):
+        compact["b"] = message["branchId"]
+    return compact
+
+
+def create_token_batch(
+    items: List[Union[AgentTokenMessage, CompactTokenMessage]]
+) -> AgentTokensBatchMessage:
+    """Wrap several token messages in a single batch frame"""
+    return {"type": "agent_tokens_batch", "items": list(items)}
+
+
 def create_debate_complete() -> DebateCompleteMessage:
     """Create a debate complete message"""
     return {
         "type": "debate_complete",
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
@@ -137,7 +232,7 @@ def create_error(message: str) -> ErrorMessage:
     return {
         "type": "error",
         "message": message,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
@@ -146,7 +241,7 @@ def create_connection_ack(client_id: str) -> ConnectionAckMessage:
     return {
         "type": "connection_ack",
         "client_id": client_id,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
@@ -156,7 +251,7 @@ def create_phase_change(phase: str, active_agents: list[str]) -> PhaseChangeMess
         "type": "phase_change",
         "phase": phase,
         "activeAgents": active_agents,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
@@ -166,7 +261,7 @@ def create_metrics(tokens_per_second: int, total_tokens: int) -> MetricsMessage:
         "type": "metrics",
         "tokensPerSecond": tokens_per_second,
         "totalTokens": total_tokens,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
@@ -175,7 +270,7 @@ def create_agent_done(agent_id: str) -> AgentDoneMessage:
     return {
         "type": "agent_done",
         "agentId": agent_id,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
 
 
@@ -185,5 +280,5 @@ def create_agent_error(agent_id: str, error: str) -> AgentErrorMessage:
         "type": "agent_error",
         "agentId": agent_id,
         "error": error,
-        "timestamp": int(datetime.now().timestamp() * 1000)
+        "timestamp": time.time_ns() // 1_000_000
     }
@@ -0,0 +1,55 @@
+"""
+Shared pytest fixtures
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents.cache import response_cache
+
+
+def make_chunk(content=None, usage=None, time_info=None):
+    """Build a fake Cerebras streaming chunk."""
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta)],
+        usage=usage,
+        time_info=time_info,
+    )
+
+
+class FakeStream:
+    """Async chunk stream with the AsyncCerebras streaming interface."""
+
+    def __init__(self, tokens=(), delay=0.0):
+        self.chunks = [make_chunk(t) for t in tokens]
+        self.delay = delay
+        self.pulled = 0
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            await asyncio.sleep(self.delay)
+            self.pulled += 1
+            yield chunk
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Keep the process-wide response cache from leaking between tests"""
+    response_cache.clear()
+    yield
+    response_cache.clear()
@@ -2,9 +2,13 @@
 Tests for the agents module
 """
 
+import asyncio
+
 import pytest
+from conftest import FakeStream
 from app.agents import (
     AGENT_REGISTRY,
+    get_agent,
     AnalystAgent,
     OptimistAgent,
     PessimistAgent,
@@ -39,6 +43,11 @@ class TestAgentRegistry:
         for agent_id, agent_class in AGENT_REGISTRY.items():
             assert isinstance(agent_class, type), f"{agent_id} should be a class"
 
+    def test_get_agent_resolves_lazily(self):
+        """get_agent imports and returns the same class the package exports"""
+        assert get_agent("analyst") is AnalystAgent
+        assert AGENT_REGISTRY["critic"] is CriticAgent
+
 
 class TestAgentInstantiation:
     """Test all agents can be instantiated with correct properties"""
@@ -115,6 +124,41 @@ class TestAgentInstantiation:
         assert "consensus" in agent.system_prompt.lower() or "debate" in agent.system_prompt.lower()
 
 
+class TestSharedClient:
+    """Agents reuse one Cerebras client per API key"""
+
+    def test_agents_share_client(self):
+        """Different agent types built with the same key share a client"""
+        assert AnalystAgent().client is CriticAgent().client
+
+    def test_distinct_keys_get_distinct_clients(self):
+        """A user-provided key gets its own client"""
+        default_agent = AnalystAgent()
+        override_agent = AnalystAgent(api_key="csk-testoverridekey123")
+        assert override_agent.client is not default_agent.client
+
+    @pytest.mark.asyncio
+    async def test_evicted_override_client_is_closed(self, monkeypatch):
+        """Clients for user keys are closed when they fall out of the LRU"""
+        from collections import OrderedDict
+        from unittest.mock import AsyncMock
+        from app.agents import _cerebras
+
+        monkeypatch.setattr(_cerebras, "_new_client", lambda api_key: AsyncMock())
+        monkeypatch.setattr(_cerebras, "MAX_OVERRIDE_CLIENTS", 2)
+        monkeypatch.setattr(_cerebras, "_override_clients", OrderedDict())
+
+        first = _cerebras.get_cerebras_client("csk-userkeyaaaaaaaa1")
+        second = _cerebras.get_cerebras_client("csk-userkeyaaaaaaaa2")
+        assert _cerebras.get_cerebras_client("csk-userkeyaaaaaaaa1") is first
+        _cerebras.get_cerebras_client("csk-userkeyaaaaaaaa3")
+        await asyncio.sleep(0)
+
+        second.close.assert_awaited_once()
+        first.close.assert_not_called()
+        assert "csk-userkeyaaaaaaaa1" not in _cerebras._override_clients
+
+
 class TestAgentPrompts:
     """Test agent prompts have required content - AC #3"""
 
@@ -146,6 +190,12 @@ class TestAgentPrompts:
             assert "role" in prompt, f"{agent_id} should define ROLE"
             assert "personality" in prompt, f"{agent_id} should define PERSONALITY"
 
+    def test_prompt_file_read_once(self):
+        """Re-instantiating an agent reuses the cached prompt text"""
+        first = AnalystAgent()
+        second = AnalystAgent()
+        assert first.system_prompt is second.system_prompt
+
 
 class TestAgentCapabilities:
     """Test agent capabilities are defined"""
@@ -178,3 +228,241 @@ class TestAgentColors:
         for agent_id, expected_color in expected_colors.items():
             agent = AGENT_REGISTRY[agent_id]()
             assert agent.color == expected_color, f"{agent_id} color should be {expected_color}"
+
+
+class TestTokenCoalescing:
+    """Test streamed tokens are coalesced into batched agent_token messages"""
+
+    @pytest.mark.asyncio
+    async def test_tokens_flushed_in_batches(self):
+        """Tokens are joined into batches of TOKEN_BATCH_SIZE"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        agent = AnalystAgent()
+        agent.TOKEN_FLUSH_INTERVAL = float("inf")
+        tokens = [f"t{i} " for i in range(20)]
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(return_value=FakeStream(tokens))
+
+        messages = [msg async for msg in agent.stream_response("batch query")]
+
+        token_msgs = [m for m in messages if m["type"] == "agent_token"]
+        assert len(token_msgs) == 3  # 8 + 8 + 4
+        assert "".join(m["content"] for m in token_msgs) == "".join(tokens)
+        assert messages[-1]["type"] == "agent_done"
+
+
+class TestBuildMetrics:
+    """Test metrics built at the end of a stream"""
+
+    def test_prefers_api_completion_time(self):
+        """Usage and time_info from the API drive the metrics"""
+        from types import SimpleNamespace
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=50, total_tokens=60)
+        time_info = SimpleNamespace(completion_time=0.5)
+
+        metrics = AnalystAgent._build_metrics(usage, time_info, token_count=40, start_time=0)
+
+        assert metrics["tokens_per_second"] == 100
+        assert metrics["total_tokens"] == 60
+        assert metrics["completion_time"] == 0.5
+        assert metrics["cached_tokens"] == 0
+
+    def test_reports_prompt_cache_hits(self):
+        """Cached prompt tokens reported by the API are passed through"""
+        from types import SimpleNamespace
+        usage = SimpleNamespace(
+            prompt_tokens=900, completion_tokens=50, total_tokens=950,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=768),
+        )
+
+        metrics = AnalystAgent._build_metrics(usage, None, token_count=50, start_time=0)
+
+        assert metrics["cached_tokens"] == 768
+        assert AnalystAgent()._create_metrics_message(**metrics)["cachedTokens"] == 768
+
+    def test_falls_back_to_counted_tokens(self):
+        """Without usage or time_info, counted tokens and wall clock are used"""
+        import time
+        metrics = AnalystAgent._build_metrics(None, None, token_count=5, start_time=time.perf_counter() - 1)
+
+        assert metrics["prompt_tokens"] == 0
+        assert metrics["completion_tokens"] == 5
+        assert metrics["total_tokens"] == 5
+        assert metrics["completion_time"] >= 1
+
+    def test_api_usage_without_time_info(self):
+        """API token counts are used even when timing falls back to wall clock"""
+        import time
+        from types import SimpleNamespace
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=50, total_tokens=60)
+
+        metrics = AnalystAgent._build_metrics(usage, None, token_count=5, start_time=time.perf_counter() - 1)
+
+        assert metrics["completion_tokens"] == 50
+        assert 0 < metrics["tokens_per_second"] <= 50
+
+
+    @pytest.mark.asyncio
+    async def test_usage_read_from_final_chunk(self):
+        """The metrics message reports the usage sent on the stream's last chunk"""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from conftest import make_chunk
+
+        stream = FakeStream(["a", "b"])
+        stream.chunks.append(make_chunk(
+            usage=SimpleNamespace(prompt_tokens=7, completion_tokens=2, total_tokens=9),
+            time_info=SimpleNamespace(completion_time=0.1),
+        ))
+        agent = AnalystAgent()
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(return_value=stream)
+
+        messages = [msg async for msg in agent.stream_response("usage query")]
+        metrics = next(m for m in messages if m["type"] == "agent_metrics")
+
+        assert metrics["promptTokens"] == 7
+        assert metrics["totalTokens"] == 9
+        assert metrics["completionTime"] == 0.1
+        assert metrics["cached"] is False
+
+class TestStreamCancellation:
+    """Test a cancelled consumer stops the stream producer"""
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_pulling_chunks(self):
+        """Cancelling mid-stream closes the SDK stream and stops pulling chunks"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        stream = FakeStream([f"t{i} " for i in range(50)], delay=0.001)
+        agent = AnalystAgent()
+        agent.TOKEN_BATCH_SIZE = 1
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(return_value=stream)
+
+        received = []
+
+        async def consume():
+            async for msg in agent.stream_response("cancel query"):
+                received.append(msg)
+
+        task = asyncio.create_task(consume())
+        while len(received) < 4:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        pulled = stream.pulled
+        await asyncio.sleep(0.05)
+
+        assert stream.closed
+        assert stream.pulled == pulled < 50
+
+
+class TestMessageTemplates:
+    """Test message factories built from per-agent templates"""
+
+    def test_messages_do_not_share_state(self):
+        """Each message is a fresh dict with the full key set"""
+        agent = AnalystAgent()
+        first = agent._create_token_message("a")
+        second = agent._create_token_message("b")
+
+        assert first is not second
+        assert first["content"] == "a"
+        assert list(first) == ["type", "agentId", "content", "timestamp"]
+        assert agent._create_done_message()["type"] == "agent_done"
+        assert "content" not in agent._token_base
+
+
+class TestConversationHistory:
+    """Test agent conversation history stays bounded"""
+
+    @pytest.mark.asyncio
+    async def test_history_is_capped(self):
+        """Old messages are dropped once the cap is reached"""
+        from app.config import settings
+
+        agent = AnalystAgent()
+        for i in range(settings.AGENT_HISTORY_MAXLEN):
+            await agent.process(f"input {i}")
+
+        assert len(agent.conversation_history) == settings.AGENT_HISTORY_MAXLEN
+        assert agent.conversation_history[-2]["content"] == f"input {settings.AGENT_HISTORY_MAXLEN - 1}"
+
+        agent.clear_history()
+        assert len(agent.conversation_history) == 0
+
+
+class TestAgentSpecs:
+    """Test agents built from AgentSpec"""
+
+    @pytest.mark.asyncio
+    async def test_max_tokens_sent_when_set(self):
+        """A spec's max_tokens is passed to the completion request"""
+        from dataclasses import replace
+        from unittest.mock import AsyncMock, MagicMock
+        from app.agents import ConfigurableLLMAgent
+        from app.agents.specs import SPECS_BY_ID
+
+        agent_class = ConfigurableLLMAgent.for_spec(replace(SPECS_BY_ID["optimist"], max_tokens=400))
+        agent = agent_class()
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(return_value=FakeStream(["ok"]))
+
+        [msg async for msg in agent.stream_response("capped query")]
+
+        assert agent.client.chat.completions.create.call_args.kwargs["max_tokens"] == 400
+
+    @pytest.mark.asyncio
+    async def test_model_override_leaves_base_params(self):
+        """A model override applies to one request without changing the agent's params"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        agent = AnalystAgent()
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(side_effect=lambda **kw: FakeStream(["ok"]))
+
+        [msg async for msg in agent.stream_response("override query", model_override="llama3.1-8b")]
+        [msg async for msg in agent.stream_response("default query")]
+
+        first, second = agent.client.chat.completions.create.call_args_list
+        assert first.kwargs["model"] == "llama3.1-8b"
+        assert second.kwargs["model"] == agent.model
+        assert second.kwargs["messages"][0] is agent._system_msg
+
+
+class TestIndustryAgents:
+    """Test industry-specific agent lookups"""
+
+    def test_industry_lookups_are_shared(self):
+        """Industry registries and agent classes are built once, not per call"""
+        from app.agents.industry import get_industry_agent_registry
+
+        registry = get_industry_agent_registry("saas")
+        assert get_industry_agent_registry("saas") is registry
+        assert registry["saas_metrics"].__name__ == "SaasMetricsAgent"
+        assert registry["analyst"] is AnalystAgent
+
+    def test_industry_agents_replace_finance_and_risk(self):
+        """Industry specialists take the finance and risk slots"""
+        from app.agents.industry import get_industry_agent_ids, get_industry_agent_info
+
+        ids = get_industry_agent_ids("fintech")
+        assert ids[5:7] == ["fintech_compliance", "fintech_risk"]
+        ids.append("extra")
+        assert "extra" not in get_industry_agent_ids("fintech")
+
+        info = get_industry_agent_info("fintech")
+        assert "finance" not in info and "risk" not in info
+        assert info["fintech_risk"]["name"] == "Fintech Risk"
+        assert get_industry_agent_ids(None) == get_industry_agent_ids("unknown")
+
+    def test_base_agent_info_matches_specs(self):
+        """Agent info served to the frontend uses the spec colors"""
+        from app.agents.industry import get_industry_agent_info
+        from app.agents.specs import AGENT_SPECS
+
+        info = get_industry_agent_info()
+        for spec in AGENT_SPECS:
+            assert info[spec.agent_id] == {"name": spec.name, "color": spec.color}
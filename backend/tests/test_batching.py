@@ -0,0 +1,162 @@
+"""
+Tests for WebSocket token frame batching
+"""
+
+import asyncio
+
+import pytest
+
+from app.websocket.batching import forward_messages
+
+
+def token(agent_id, content):
+    return {"type": "agent_token", "agentId": agent_id, "content": content, "timestamp": 0}
+
+
+async def stream(messages, delay=0.0):
+    for message in messages:
+        if delay:
+            await asyncio.sleep(delay)
+        yield message
+
+
+class TestForwardMessages:
+    """Test forwarding debate messages to the client"""
+
+    @pytest.mark.asyncio
+    async def test_unbatched_sends_each_message(self):
+        """Without batchTokens every message is its own frame"""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        messages = [token("analyst", "a"), token("critic", "b")]
+        await forward_messages(stream(messages), send)
+
+        assert sent == messages
+
+    @pytest.mark.asyncio
+    async def test_backlog_merges_same_agent_tokens(self):
+        """Tokens queued behind the sender are merged per agent, in order"""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        done = {"type": "agent_done", "agentId": "analyst", "timestamp": 0}
+        messages = [token("analyst", "a"), token("analyst", "b"), token("analyst", "c"),
+                    token("critic", "d"), done]
+        await forward_messages(stream(messages), send)
+
+        assert [(m["type"], m.get("content")) for m in sent] == [
+            ("agent_token", "abc"),
+            ("agent_token", "d"),
+            ("agent_done", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batches_tokens_and_keeps_order(self):
+        """Queued tokens share a frame; other messages flush the batch first"""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        done = {"type": "agent_done", "agentId": "analyst", "timestamp": 0}
+        messages = [token("analyst", "a"), token("critic", "b"), done, token("critic", "c")]
+        await forward_messages(stream(messages), send, batch=True)
+
+        assert [m["type"] for m in sent] == ["agent_tokens_batch", "agent_done", "agent_token"]
+        assert [m["content"] for m in sent[0]["items"]] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_capped(self, monkeypatch):
+        """A full batch is sent without waiting for the linger timeout"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "WS_BATCH_MAX_TOKENS", 2)
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await forward_messages(stream([token("analyst", str(i)) for i in range(5)]), send, batch=True)
+
+        assert [len(m["items"]) for m in sent[:2]] == [2, 2]
+        assert sent[2]["content"] == "4"
+
+    @pytest.mark.asyncio
+    async def test_compact_items_in_batch(self):
+        """compactTokens applies to the tokens inside a batch"""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await forward_messages(stream([token("analyst", "a"), token("analyst", "b")]), send,
+                               compact=True, batch=True)
+
+        assert sent[0]["items"] == [{"t": "k", "a": "analyst", "c": "a"}, {"t": "k", "a": "analyst", "c": "b"}]
+
+    @pytest.mark.asyncio
+    async def test_stream_errors_propagate(self):
+        """A failing debate stream raises to the caller after pending tokens are sent"""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        async def failing():
+            yield token("analyst", "a")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await forward_messages(failing(), send, batch=True)
+        assert sent[0]["content"] == "a"
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_debate_stream(self):
+        """Cancelling the forwarder closes the debate stream"""
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield token("analyst", "x")
+                    await asyncio.sleep(0.001)
+            finally:
+                closed.set()
+
+        async def send(message):
+            pass
+
+        task = asyncio.create_task(forward_messages(endless(), send, batch=True))
+        await asyncio.sleep(0.02)
+        task.cancel()
+
+        await asyncio.wait_for(closed.wait(), timeout=1)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batch", [False, True])
+    async def test_cancel_waits_for_stream_cleanup(self, batch):
+        """The forwarder returns only after the debate stream has closed"""
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield token("analyst", "x")
+                    await asyncio.sleep(0.001)
+            finally:
+                await asyncio.sleep(0.01)
+                closed.set()
+
+        async def send(message):
+            pass
+
+        task = asyncio.create_task(forward_messages(endless(), send, batch=batch))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        await asyncio.wait({task})
+
+        assert closed.is_set()
@@ -139,6 +139,15 @@ class TestBlackboard:
         assert len(bb.entries) == 1
         assert bb.entries[0].content == "This is line one."
 
+    def test_add_token_splits_at_earliest_boundary(self):
+        """AC #1: With mixed punctuation the first boundary in the text ends the thought"""
+        bb = Blackboard()
+
+        bb.add_token("analyst", "Is it ready yet? Yes it is. Go")
+
+        assert bb.entries[0].content == "Is it ready yet?"
+        assert bb.pending_tokens["analyst"] == "Yes it is. Go"
+
     def test_add_token_avoids_tiny_fragments(self):
         """AC #1: add_token() avoids tiny fragments under 10 chars"""
         bb = Blackboard()
@@ -329,3 +338,31 @@ class TestBlackboard:
         # Check order is maintained
         timestamps = [e.timestamp for e in bb.entries]
         assert timestamps == sorted(timestamps)
+
+    def test_token_count_matches_recount_after_truncation(self):
+        """AC #3: The running token count matches a full recount after evictions"""
+        bb = Blackboard(max_tokens=20)
+
+        for i in range(10):
+            bb.append("analyst", f"Entry {i} has a handful of words.")
+            if i == 3:
+                bb.append("user", "Keep it under budget", is_user_constraint=True)
+
+        recount = bb._estimate_tokens(" ".join(e.content for e in bb.entries))
+        assert bb.get_token_count() == recount
+        assert len(bb.get_user_constraints()) == 1
+
+        bb.clear()
+        assert bb.get_token_count() == 0
+
+    def test_get_context_reflects_new_entries(self):
+        """AC #2: A repeated get_context() call sees entries appended since the last one"""
+        bb = Blackboard()
+
+        bb.append("analyst", "Analyst thought.")
+        first = bb.get_context(exclude_agent="critic")
+        assert bb.get_context(exclude_agent="critic") == first
+
+        bb.append("optimist", "Optimist reply.")
+
+        assert "[OPTIMIST]: Optimist reply." in bb.get_context(exclude_agent="critic")
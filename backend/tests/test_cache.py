@@ -0,0 +1,131 @@
+"""
+Tests for the agent response cache
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from conftest import FakeStream
+
+from app.agents import AnalystAgent
+from app.agents.cache import CachedResponse, ResponseCache, response_cache
+
+
+METRICS = {
+    "tokens_per_second": 100.0,
+    "total_tokens": 12,
+    "prompt_tokens": 10,
+    "completion_tokens": 2,
+    "completion_time": 0.02,
+}
+
+
+class TestResponseCache:
+    """Test ResponseCache LRU behaviour"""
+
+    def test_key_depends_on_all_inputs(self):
+        """Model, system prompt and query all change the key"""
+        base = ResponseCache.make_key("m", "sys", "q")
+        assert base == ResponseCache.make_key("m", "sys", "q")
+        assert base != ResponseCache.make_key("m2", "sys", "q")
+        assert base != ResponseCache.make_key("m", "sys2", "q")
+        assert base != ResponseCache.make_key("m", "sys", "q2")
+        assert base != ResponseCache.make_key("m", "sys", "q", key_id="other")
+
+    def test_get_returns_stored_entry(self):
+        """Stored entries are returned on get"""
+        cache = ResponseCache(max_entries=2)
+        entry = CachedResponse(("a", "b"), METRICS)
+        cache.put("k", entry)
+        assert cache.get("k") is entry
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """The oldest untouched entry is evicted when full"""
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", CachedResponse(("a",), METRICS))
+        cache.put("b", CachedResponse(("b",), METRICS))
+        cache.get("a")
+        cache.put("c", CachedResponse(("c",), METRICS))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert len(cache) == 2
+
+    def test_zero_size_disables_cache(self):
+        """max_entries=0 stores nothing"""
+        cache = ResponseCache(max_entries=0)
+        cache.put("k", CachedResponse(("a",), METRICS))
+        assert len(cache) == 0
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        """Entries older than ttl are dropped on lookup"""
+        import time
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        cache = ResponseCache(max_entries=2, ttl=60)
+        cache.put("k", CachedResponse(("a",), METRICS))
+
+        now[0] += 59
+        assert cache.get("k") is not None
+        now[0] += 1
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+
+class TestAgentCacheReplay:
+    """Test agents replay cached responses without calling Cerebras"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_api(self):
+        """A cached query streams tokens, metrics and done without an API call"""
+        agent = AnalystAgent()
+        key = ResponseCache.make_key(agent.model, agent.system_prompt, "cached query", agent._key_id)
+        response_cache.put(key, CachedResponse(("Hello", " world"), METRICS))
+
+        create = AsyncMock(side_effect=AssertionError("API should not be called"))
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = create
+
+        messages = [msg async for msg in agent.stream_response("cached query")]
+
+        assert [m["type"] for m in messages] == ["agent_token", "agent_token", "agent_metrics", "agent_done"]
+        assert "".join(m["content"] for m in messages[:2]) == "Hello world"
+        assert messages[2]["totalTokens"] == 12
+        assert messages[2]["cached"] is True
+        create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_other_api_key_misses(self):
+        """A response cached under the server key is not replayed for a user key"""
+        server_agent = AnalystAgent()
+        key = ResponseCache.make_key(server_agent.model, server_agent.system_prompt, "shared query", server_agent._key_id)
+        response_cache.put(key, CachedResponse(("cached",), METRICS))
+
+        user_agent = AnalystAgent(api_key="csk-testoverridekey123")
+        user_agent.client = MagicMock()
+        user_agent.client.chat.completions.create = AsyncMock(return_value=FakeStream())
+
+        messages = [msg async for msg in user_agent.stream_response("shared query")]
+
+        user_agent.client.chat.completions.create.assert_called_once()
+        assert not any(m.get("content") == "cached" for m in messages)
+
+    @pytest.mark.asyncio
+    async def test_replay_keeps_token_coalescing(self):
+        """A cache hit sends the same batched agent_token messages as the live stream"""
+        agent = AnalystAgent()
+        agent.TOKEN_FLUSH_INTERVAL = float("inf")
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(
+            return_value=FakeStream([f"t{i} " for i in range(20)])
+        )
+
+        live = [msg async for msg in agent.stream_response("replay query")]
+        replay = [msg async for msg in agent.stream_response("replay query")]
+
+        agent.client.chat.completions.create.assert_called_once()
+        replay_tokens = [m for m in replay if m["type"] == "agent_token"]
+        assert len(replay_tokens) == 3  # 8 + 8 + 4, not 20
+        assert [m["content"] for m in replay_tokens] == [m["content"] for m in live if m["type"] == "agent_token"]
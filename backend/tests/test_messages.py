@@ -0,0 +1,78 @@
+"""
+Tests for the WebSocket message helpers
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.websocket.messages import (
+    compact_token,
+    describe_invalid_message,
+    encode_message,
+    parse_inbound_message,
+)
+
+
+class TestCompactToken:
+    """Test the compact agent_token wire form"""
+
+    def test_drops_long_keys_and_timestamp(self):
+        """Only t, a and c are sent for a main-debate token"""
+        message = {"type": "agent_token", "agentId": "analyst", "content": "Hi", "timestamp": 1}
+        assert compact_token(message) == {"t": "k", "a": "analyst", "c": "Hi"}
+
+    def test_keeps_branch_id(self):
+        """Branch tokens carry their branch as b"""
+        message = {"type": "agent_token", "agentId": "critic", "content": "x", "branchId": "best", "timestamp": 1}
+        assert compact_token(message)["b"] == "best"
+
+
+class TestEncodeMessage:
+    """Test outbound message serialization"""
+
+    def test_matches_stdlib_json(self):
+        """orjson output decodes to the same message, unicode kept as-is"""
+        message = {"type": "agent_token", "agentId": "analyst", "content": "naïve → ok", "timestamp": 1}
+        encoded = encode_message(message)
+        assert json.loads(encoded) == message
+        assert "naïve" in encoded
+
+    def test_non_string_keys(self):
+        """Benchmark rounds keyed by int are written with string keys"""
+        assert json.loads(encode_message({"rounds": {1: {"name": "Opening"}}})) == {"rounds": {"1": {"name": "Opening"}}}
+
+
+class TestInboundMessages:
+    """Test parsing and validating client messages"""
+
+    def test_start_debate_defaults_and_stripping(self):
+        """Missing fields get defaults and strings are stripped"""
+        message = parse_inbound_message('{"type": "start_debate", "query": "  Should we?  ", "apiKey": " csk-abc "}')
+        assert message.query == "Should we?"
+        assert message.model == "pro"
+        assert message.selectedAgents is None
+        assert message.api_key == "csk-abc"
+        assert not message.compactTokens
+
+    def test_api_key_masked_in_repr(self):
+        """Logging a parsed message does not reveal the API key"""
+        message = parse_inbound_message('{"type": "start_branching", "query": "q", "apiKey": "csk-secretvalue"}')
+        assert "csk-secretvalue" not in repr(message)
+
+    def test_blank_api_key_is_none(self):
+        """An empty apiKey means no user key"""
+        assert parse_inbound_message('{"type": "start_debate", "apiKey": "  "}').api_key is None
+
+    @pytest.mark.parametrize("data, expected", [
+        ("{not json", "Invalid JSON message"),
+        ('{"type": "dance"}', "Unknown message type: dance"),
+        ('{"query": "q"}', "Unknown message type: None"),
+        ('{"type": "start_debate", "selectedAgents": 5}', "Invalid selectedAgents: Input should be a valid array"),
+    ])
+    def test_invalid_messages_are_described(self, data, expected):
+        """Validation failures map to the error text sent to the client"""
+        with pytest.raises(ValidationError) as exc_info:
+            parse_inbound_message(data)
+        assert describe_invalid_message(exc_info.value) == expected
@@ -512,3 +512,164 @@ class TestBlackboardIntegration:
 
         assert "Analyst first thought" not in context
         assert "Critic response here" in context
+
+
+class TestRoundCancellation:
+    """Test cancelling a round stops its agent streams"""
+
+    @pytest.mark.asyncio
+    async def test_closing_round_cancels_agent_tasks(self):
+        """Agents still streaming are cancelled when the round consumer stops"""
+        from app.orchestrator.debate import DebateRound
+
+        cancelled = asyncio.Event()
+
+        async def endless_stream(query, model_override=None, use_reasoning=False):
+            try:
+                while True:
+                    yield {"type": "agent_token", "agentId": "analyst", "content": "x", "timestamp": 0}
+                    await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        orchestrator = DebateOrchestrator()
+        orchestrator.start_time = 0
+        agent = MagicMock()
+        agent.stream_response = endless_stream
+        orchestrator.agents = {"analyst": agent}
+
+        round_config = DebateRound(round_num=1, name="Opening", agents=["analyst"], context_prompt="")
+        rounds = orchestrator._run_round(round_config, "query", "model", use_reasoning=False)
+        first = await rounds.__anext__()
+        await rounds.aclose()
+
+        assert first["type"] == "agent_token"
+        assert cancelled.is_set()  # aclose() returns only after the agents unwound
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_applies_backpressure(self, monkeypatch):
+        """Agents stop producing once the round queue is full"""
+        from app.config import settings
+        from app.orchestrator.debate import DebateRound
+
+        monkeypatch.setattr(settings, "STREAM_QUEUE_SIZE", 4)
+        produced = 0
+
+        async def endless_stream(query, model_override=None, use_reasoning=False):
+            nonlocal produced
+            while True:
+                produced += 1
+                yield {"type": "agent_token", "agentId": "analyst", "content": "x", "timestamp": 0}
+
+        orchestrator = DebateOrchestrator()
+        orchestrator.start_time = 0
+        agent = MagicMock()
+        agent.stream_response = endless_stream
+        orchestrator.agents = {"analyst": agent}
+
+        round_config = DebateRound(round_num=1, name="Opening", agents=["analyst"], context_prompt="")
+        rounds = orchestrator._run_round(round_config, "query", "model", use_reasoning=False)
+        await rounds.__anext__()
+        await asyncio.sleep(0.05)
+
+        assert produced <= 6
+        await rounds.aclose()
+
+    @pytest.mark.asyncio
+    async def test_interrupt_wakes_idle_round(self):
+        """A constraint interrupt restarts a round that is waiting on silent agents"""
+        from app.orchestrator.debate import DebateRound, RoundRestartRequested
+
+        async def stalled_stream(query, model_override=None, use_reasoning=False):
+            yield {"type": "agent_token", "agentId": "analyst", "content": "x", "timestamp": 0}
+            await asyncio.sleep(60)
+
+        orchestrator = DebateOrchestrator()
+        orchestrator.start_time = 0
+        orchestrator._interrupt_event = asyncio.Event()
+        agent = MagicMock()
+        agent.stream_response = stalled_stream
+        orchestrator.agents = {"analyst": agent}
+
+        round_config = DebateRound(round_num=1, name="Opening", agents=["analyst"], context_prompt="")
+        rounds = orchestrator._run_round(round_config, "query", "model", use_reasoning=False)
+        await rounds.__anext__()
+        asyncio.get_running_loop().call_later(0.02, orchestrator._interrupt_event.set)
+
+        with pytest.raises(RoundRestartRequested):
+            await asyncio.wait_for(rounds.__anext__(), timeout=1)
+        assert not orchestrator._interrupt_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_failure_after_done_does_not_end_round_early(self):
+        """An agent that raises after finishing sends no second agent_done"""
+        from app.orchestrator.debate import DebateRound
+
+        async def failing_stream(query, model_override=None, use_reasoning=False):
+            yield {"type": "agent_done", "agentId": "analyst", "timestamp": 0}
+            raise RuntimeError("late failure")
+
+        async def slow_stream(query, model_override=None, use_reasoning=False):
+            await asyncio.sleep(0.05)
+            yield {"type": "agent_done", "agentId": "critic", "timestamp": 0}
+
+        orchestrator = DebateOrchestrator()
+        orchestrator.start_time = 0
+        analyst, critic = MagicMock(), MagicMock()
+        analyst.stream_response = failing_stream
+        critic.stream_response = slow_stream
+        orchestrator.agents = {"analyst": analyst, "critic": critic}
+
+        round_config = DebateRound(round_num=1, name="Opening", agents=["analyst", "critic"], context_prompt="")
+        messages = [m async for m in orchestrator._run_round(round_config, "query", "model", use_reasoning=False)]
+
+        assert [m["agentId"] for m in messages if m["type"] == "agent_done"] == ["analyst", "critic"]
+
+    @pytest.mark.asyncio
+    async def test_closing_branching_with_full_queue_returns(self, monkeypatch):
+        """Closing a branching run whose queue is full does not hang on the branch sentinels"""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "STREAM_QUEUE_SIZE", 2)
+
+        async def endless_debate(self, query, *args, **kwargs):
+            while True:
+                yield {"type": "agent_token", "agentId": "analyst", "content": "x", "timestamp": 0}
+
+        monkeypatch.setattr(DebateOrchestrator, "stream_debate", endless_debate)
+
+        branching = DebateOrchestrator().stream_branching_debate("query")
+        await branching.__anext__()
+        await asyncio.sleep(0.01)  # Let the branches fill the queue and block
+
+        await asyncio.wait_for(branching.aclose(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_closing_round_with_full_queue_returns(self, monkeypatch):
+        """An agent that fails while being cancelled does not block on a full round queue"""
+        from app.config import settings
+        from app.orchestrator.debate import DebateRound
+
+        monkeypatch.setattr(settings, "STREAM_QUEUE_SIZE", 1)
+
+        async def converting_stream(query, model_override=None, use_reasoning=False):
+            yield {"type": "agent_token", "agentId": "analyst", "content": "x", "timestamp": 0}
+            yield {"type": "agent_token", "agentId": "analyst", "content": "y", "timestamp": 0}
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                raise RuntimeError("stream closed")
+
+        orchestrator = DebateOrchestrator()
+        orchestrator.start_time = 0
+        agent = MagicMock()
+        agent.stream_response = converting_stream
+        orchestrator.agents = {"analyst": agent}
+
+        round_config = DebateRound(round_num=1, name="Opening", agents=["analyst"], context_prompt="")
+        rounds = orchestrator._run_round(round_config, "query", "model", use_reasoning=False)
+        await rounds.__anext__()
+        await asyncio.sleep(0.01)  # Second token fills the queue; the agent sleeps
+
+        await asyncio.wait_for(rounds.aclose(), timeout=1)
@@ -38,6 +38,7 @@ export interface BenchmarkReport {
       p95ItlMs: number | null;
       chunks: number;
       promptTokens?: number;
+      cachedTokens?: number;
       completionTokens?: number;
       totalTokens?: number;
       completionTimeSec?: number;
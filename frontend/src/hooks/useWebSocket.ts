@@ -2,8 +2,18 @@ import { useEffect, useRef, useCallback, useState } from 'react';
 import { useDebateStore } from '@/hooks/useDebateStore';
 import { useApiKeyStore } from '@/hooks/useApiKeyStore';
 import { WS_URL } from '@/lib/backend';
-import type { WebSocketMessage } from '@/types';
+import type { AgentTokenMessage, AgentTokensBatchMessage, CompactTokenMessage, WebSocketMessage } from '@/types';
 import type { Phase, AgentId } from '@/types/agent';
+
+// Expand a compact token frame back into the full agent_token message
+const expandCompactToken = (frame: CompactTokenMessage): AgentTokenMessage => ({
+  type: 'agent_token',
+  agentId: frame.a,
+  content: frame.c,
+  ...(frame.b ? { branchId: frame.b } : {}),
+  timestamp: Date.now(),
+});
+
 const MAX_RETRIES = 3;
 const INITIAL_RETRY_DELAY = 1000;
 
@@ -93,10 +103,11 @@ export function useWebSocket({ autoConnect = false }: { autoConnect?: boolean }
         setShowApiKeyModal(true);
       };
 
-      ws.current.onmessage = (event) => {
+      // Handle one server message; batch frames are unpacked in onmessage
+      const handleFrame = (raw: WebSocketMessage | CompactTokenMessage) => {
         if (isUnmountingRef.current) return;
         try {
-          const data: WebSocketMessage = JSON.parse(event.data);
+          const data: WebSocketMessage = 't' in raw ? expandCompactToken(raw) : raw;
           const debateStartTime = useDebateStore.getState().debateStartTime;
           const getTimestamp = () => debateStartTime ? Date.now() - debateStartTime : 0;
           const branchId = 'branchId' in data ? data.branchId : undefined;
@@ -268,8 +279,24 @@ export function useWebSocket({ autoConnect = false }: { autoConnect?: boolean }
               console.warn('Unknown message type:', data);
             }
           }
+        } catch (err) {
+          console.error('Failed to handle message:', err);
+        }
+      };
+
+      ws.current.onmessage = (event) => {
+        if (isUnmountingRef.current) return;
+        let raw: WebSocketMessage | CompactTokenMessage | AgentTokensBatchMessage;
+        try {
+          raw = JSON.parse(event.data);
         } catch (err) {
           console.error('Failed to parse message:', err);
+          return;
+        }
+        if ('type' in raw && raw.type === 'agent_tokens_batch') {
+          raw.items.forEach(handleFrame);
+        } else {
+          handleFrame(raw);
         }
       };
     } catch (err) {
@@ -353,6 +380,8 @@ export function useWebSocket({ autoConnect = false }: { autoConnect?: boolean }
       previousContext: previousContext || '',
       selectedAgents: selectedAgents || null,
       industry: industry || '',
+      compactTokens: true,
+      batchTokens: true,
       ...(resolvedApiKey ? { apiKey: resolvedApiKey } : {}),
     });
   }, [sendMessage, startDebate, apiKey]);
@@ -375,6 +404,8 @@ export function useWebSocket({ autoConnect = false }: { autoConnect?: boolean }
       previousContext: previousContext || '',
       selectedAgents: selectedAgents || null,
       industry: industry || '',
+      compactTokens: true,
+      batchTokens: true,
       ...(resolvedApiKey ? { apiKey: resolvedApiKey } : {}),
     });
   }, [sendMessage, apiKey]);
@@ -401,6 +432,8 @@ export function useWebSocket({ autoConnect = false }: { autoConnect?: boolean }
       previousContext: previousContext || '',
       selectedAgents: selectedAgents || null,
       industry: industry || '',
+      compactTokens: true,
+      batchTokens: true,
       ...(resolvedApiKey ? { apiKey: resolvedApiKey } : {}),
     });
   }, [sendMessage, startScenarioRun, apiKey]);
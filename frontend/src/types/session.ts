@@ -25,6 +25,7 @@ export interface DebateTurn {
         p95ItlMs: number | null;
         chunks: number;
         promptTokens?: number;
+        cachedTokens?: number;
         completionTokens?: number;
         totalTokens?: number;
         completionTimeSec?: number;
@@ -10,6 +10,8 @@ export interface StartDebateMessage {
   selectedAgents?: AgentId[] | null;
   industry?: string;
   apiKey?: string;
+  compactTokens?: boolean;
+  batchTokens?: boolean;
 }
 
 export interface StartBranchingMessage {
@@ -20,6 +22,8 @@ export interface StartBranchingMessage {
   selectedAgents?: AgentId[] | null;
   industry?: string;
   apiKey?: string;
+  compactTokens?: boolean;
+  batchTokens?: boolean;
 }
 
 export interface AgentTokenMessage {
@@ -30,6 +34,20 @@ export interface AgentTokenMessage {
   timestamp: number;
 }
 
+// Short-key agent_token frame sent when the client asks for compactTokens
+export interface CompactTokenMessage {
+  t: 'k';
+  a: AgentId;
+  c: string;
+  b?: BranchId;
+}
+
+// Several token frames sent together when the client asks for batchTokens
+export interface AgentTokensBatchMessage {
+  type: 'agent_tokens_batch';
+  items: Array<AgentTokenMessage | CompactTokenMessage>;
+}
+
 export interface AgentMetricsMessage {
   type: 'agent_metrics';
   agentId: AgentId;
@@ -38,6 +56,8 @@ export interface AgentMetricsMessage {
   promptTokens: number;
   completionTokens: number;
   completionTime: number;
+  cachedTokens: number; // Prompt tokens served from Cerebras' prompt cache
+  cached: boolean; // Replayed from the server's response cache; usage is from the original run
   branchId?: BranchId;
   timestamp: number;
 }
@@ -95,6 +115,7 @@ export interface DebateCompleteMessage {
         p95ItlMs: number | null;
         chunks: number;
         promptTokens?: number;
+        cachedTokens?: number;
         completionTokens?: number;
         totalTokens?: number;
         completionTimeSec?: number;